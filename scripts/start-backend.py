@@ -17,11 +17,19 @@ if __name__ == "__main__":
     print("Health Check: http://localhost:8000/api/health")
     print("---")
     
+    # Auto-reload only in development (DEV=1); reload and workers are exclusive.
+    # Task status lives in process memory unless REDIS_URL is set, so keep a
+    # single worker by default and only raise WEB_CONCURRENCY with Redis.
+    dev_mode = bool(os.getenv("DEV"))
+    
     uvicorn.run(
         "web.backend.app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=dev_mode,
+        workers=None if dev_mode else int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
         log_level="warning",
         access_log=False
     )
\ No newline at end of file
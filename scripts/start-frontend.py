@@ -2,12 +2,25 @@
 """Start the Streamlit frontend"""
 
 import os
-import subprocess
 import sys
 
+from streamlit.web import bootstrap
+
+# Add the project root to Python path (the app imports `src.*`); `streamlit run`
+# used to provide this via the working directory, running in-process does not
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
 # Path to the Streamlit app
 frontend_app = os.path.join(os.path.dirname(__file__), "../web/frontend/app.py")
 
+# Streamlit CLI flags, keyed the way `streamlit run` passes them to bootstrap
+flag_options = {
+    "server_port": 8501,
+    "server_address": "0.0.0.0",
+    "browser_gatherUsageStats": False,
+}
+
 if __name__ == "__main__":
     print("Starting Factsheet Generator Web Interface...")
     print("Web App: http://localhost:8501")
@@ -15,13 +28,9 @@ if __name__ == "__main__":
     print("---")
     
     try:
-        # Start Streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", frontend_app,
-            "--server.port", "8501",
-            "--server.address", "0.0.0.0",
-            "--browser.gatherUsageStats", "false"
-        ])
+        # Run Streamlit in-process instead of spawning a second interpreter
+        bootstrap.load_config_options(flag_options=flag_options)
+        bootstrap.run(frontend_app, False, [], flag_options)
     except KeyboardInterrupt:
         print("\nShutting down frontend...")
-        sys.exit(0)
\ No newline at end of file
+        sys.exit(0)
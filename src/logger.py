@@ -1,10 +1,10 @@
 """Beautiful colored logger for the factsheet generator"""
 
+import functools
 import logging
 import os
 import sys
-import inspect
-from datetime import datetime
+import time
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors and clean output"""
@@ -22,22 +22,44 @@ class ColoredFormatter(logging.Formatter):
         'DIM': '\033[2m'        # Dim
     }
     
-    def format(self, record):
-        # Get color for log level
-        color = self.COLORS.get(record.levelname, '')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Timestamp only changes once per second, pathnames are a small fixed set
+        self._cached_second = None
+        self._cached_timestamp = ''
+        self._basenames = {}
+        
+        # Colored "[LEVEL]" labels, built once instead of per record
         reset = self.COLORS['RESET']
+        self._level_labels = {
+            levelname: f"{color}[{levelname}]{reset}"
+            for levelname, color in self.COLORS.items()
+            if levelname not in ('RESET', 'BOLD', 'DIM')
+        }
+    
+    def format(self, record):
+        # Get colored label for log level
+        level_label = self._level_labels.get(record.levelname)
+        if level_label is None:
+            level_label = f"[{record.levelname}]{self.COLORS['RESET']}"
         
-        # Format timestamp (date and time, no milliseconds)
-        timestamp = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
+        # Format timestamp (date and time, no milliseconds), reused within the same second
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+            self._cached_second = second
+        timestamp = self._cached_timestamp
         
         # Use the record's pathname and lineno (should now be correct)
-        filename = os.path.basename(record.pathname)
+        filename = self._basenames.get(record.pathname)
+        if filename is None:
+            filename = self._basenames[record.pathname] = os.path.basename(record.pathname)
         location = f"{filename}:{record.lineno}"
         
         # Format: 2025-06-19 12:53:56 [INFO] - file.py:255 - <log msg>
         formatted_msg = (
             f"{timestamp} "
-            f"{color}[{record.levelname}]{reset} - "
+            f"{level_label} - "
             f"{location} - "
             f"{record.getMessage()}"
         )
@@ -57,10 +79,25 @@ class ColoredFormatter(logging.Formatter):
         return icons.get(levelname, 'INFO   ')
 
 
+# Noisy third-party loggers capped at WARNING
+EXTERNAL_LOGGERS = (
+    'urllib3', 'httpx', 'httpcore', 'openai', 'google.auth',
+    'google.generativeai', 'requests', 'selenium'
+)
+
+
 class FactsheetLogger:
     """Clean, beautiful logger for the factsheet generator"""
     
+    _level_registered = False
+    _external_silenced = False
+    
     def __init__(self, name: str = "factsheet"):
+        # Add SUCCESS level to logging module (once per process)
+        if not FactsheetLogger._level_registered:
+            logging.addLevelName(25, 'SUCCESS')
+            FactsheetLogger._level_registered = True
+        
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.INFO)
         
@@ -81,66 +118,45 @@ class FactsheetLogger:
         self._silence_external_loggers()
     
     def _silence_external_loggers(self):
-        """Silence external library loggers"""
-        external_loggers = [
-            'urllib3', 'httpx', 'httpcore', 'openai', 'google.auth',
-            'google.generativeai', 'requests', 'selenium'
-        ]
+        """Silence external library loggers (once per process)"""
+        if FactsheetLogger._external_silenced:
+            return
         
-        for logger_name in external_loggers:
+        for logger_name in EXTERNAL_LOGGERS:
             logging.getLogger(logger_name).setLevel(logging.WARNING)
+        FactsheetLogger._external_silenced = True
     
-    def _log_with_caller(self, level, message):
-        """Log with proper caller information"""
-        frame = inspect.currentframe()
-        try:
-            # Get the caller's frame (skip this method and the public method)
-            caller_frame = frame.f_back.f_back
-            if caller_frame:
-                # Create a new log record with the caller's information
-                record = logging.LogRecord(
-                    name=self.logger.name,
-                    level=level,
-                    pathname=caller_frame.f_code.co_filename,
-                    lineno=caller_frame.f_lineno,
-                    msg=message,
-                    args=(),
-                    exc_info=None
-                )
-                self.logger.handle(record)
-            else:
-                # Fallback to normal logging
-                self.logger.log(level, message)
-        finally:
-            del frame
-    
-    def debug(self, message: str):
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a message at `level` would be emitted (lets callers skip building it)"""
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args):
         """Log debug message"""
-        self._log_with_caller(logging.DEBUG, message)
+        self.logger.log(logging.DEBUG, message, *args, stacklevel=2)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message"""
-        self._log_with_caller(logging.INFO, message)
+        self.logger.log(logging.INFO, message, *args, stacklevel=2)
     
-    def success(self, message: str):
+    def success(self, message: str, *args):
         """Log success message"""
-        self._log_with_caller(25, message)  # Between INFO(20) and WARNING(30)
+        self.logger.log(25, message, *args, stacklevel=2)  # Between INFO(20) and WARNING(30)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
-        self._log_with_caller(logging.WARNING, message)
+        self.logger.log(logging.WARNING, message, *args, stacklevel=2)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
-        self._log_with_caller(logging.ERROR, message)
+        self.logger.log(logging.ERROR, message, *args, stacklevel=2)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """Log critical message"""
-        self._log_with_caller(logging.CRITICAL, message)
+        self.logger.log(logging.CRITICAL, message, *args, stacklevel=2)
     
     def step(self, step_num: int, message: str):
         """Log a step in the process"""
-        self.info(f"Step {step_num}: {message}")
+        self.logger.log(logging.INFO, "Step %s: %s", step_num, message, stacklevel=2)
     
     def set_verbose(self, verbose: bool = True):
         """Enable/disable verbose logging"""
@@ -154,8 +170,15 @@ class FactsheetLogger:
                 handler.setLevel(logging.INFO)
 
 
-# Global logger instance
-logger = FactsheetLogger()
 
-# Add SUCCESS level to logging module
-logging.addLevelName(25, 'SUCCESS')
\ No newline at end of file
+@functools.cache
+def get_logger() -> FactsheetLogger:
+    """Return the shared logger, creating it on first use"""
+    return FactsheetLogger()
+
+
+def __getattr__(name):
+    # Keep `from logger import logger` working without configuring logging at import time
+    if name == 'logger':
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
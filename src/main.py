@@ -8,52 +8,57 @@ for sales teams preparing for discovery calls.
 
 import argparse
 import csv
+import re
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 
 from scraper import scrape_company_data
 from synthesizer import create_factsheet
 from logger import logger
 
+# Common subdomain prefixes and characters dropped from filenames
+_DOMAIN_PREFIX_RE = re.compile(r'www\.|app\.|api\.')
+_FILENAME_STRIP = str.maketrans('', '', '-_')
+
 def sanitize_filename(title: str, fallback_url: str = "") -> str:
     """Create a safe filename from company domain"""
-    from urllib.parse import urlparse
-    
     if fallback_url:
-        domain = urlparse(fallback_url).netloc
-        domain = domain.replace('www.', '').replace('app.', '').replace('api.', '')
-        company_name = domain.split('.')[0].lower().replace('-', '').replace('_', '')
+        domain = _DOMAIN_PREFIX_RE.sub('', urlparse(fallback_url).netloc)
+        company_name = domain.split('.')[0].lower().translate(_FILENAME_STRIP)
         return f"{company_name}.md"
     else:
         return "factsheet.md"
 
 def load_companies(csv_file):
     """Load company data from CSV file"""
-    companies = []
     try:
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                companies.append({
-                    'url': row['URL'].strip(),
-                    'industry': row['Industry'].strip()
-                })
+        with open(csv_file, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            url_col = header.index('URL')
+            industry_col = header.index('Industry')
+            companies = [
+                {'url': row[url_col].strip(), 'industry': row[industry_col].strip()}
+                for row in reader if row
+            ]
     except Exception as e:
-        logger.error(f"Error loading companies from {csv_file}: {str(e)}")
+        logger.error("Error loading companies from %s: %s", csv_file, e)
         return []
     return companies
 
 def generate_factsheet_for_company(url, output_dir="factsheets", model=None):
     """Generate factsheet for a single company"""
-    logger.info(f"Starting factsheet generation for: {url}")
+    logger.info("Starting factsheet generation for: %s", url)
     
     # Step 1: Scrape company data
     logger.step(1, "Scraping company website...")
     company_data = scrape_company_data(url)
     
     if not company_data['success']:
-        logger.error(f"Failed to scrape data from {url}")
+        logger.error("Failed to scrape data from %s", url)
         return False
     
     # Step 2: Generate factsheet
@@ -73,14 +78,47 @@ def generate_factsheet_for_company(url, output_dir="factsheets", model=None):
     
     output_path = Path(output_dir) / filename
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(factsheet_content)
-        logger.success(f"Factsheet saved to: {output_path}")
+        # Encode once and hand the kernel a single buffered write
+        with open(output_path, 'wb', buffering=1024 * 1024) as f:
+            f.write(factsheet_content.encode('utf-8'))
+        logger.success("Factsheet saved to: %s", output_path)
         return True
     except Exception as e:
-        logger.error(f"Error saving factsheet: {str(e)}")
+        logger.error("Error saving factsheet: %s", e)
         return False
 
+def generate_factsheets_batch(companies, output_dir="factsheets", model=None, max_workers=8):
+    """Generate factsheets for several companies concurrently"""
+    if not companies:
+        logger.warning("No companies to process")
+        return True
+    
+    # Scraping and generation are network-bound, so threads are enough
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    succeeded = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(companies))) as executor:
+        futures = {
+            executor.submit(generate_factsheet_for_company, company['url'], output_dir, model): company
+            for company in companies
+        }
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    succeeded += 1
+            except Exception as e:
+                logger.error("Error processing %s: %s", futures[future]['url'], e)
+    
+    logger.info("Batch complete: %d/%d factsheets generated", succeeded, len(companies))
+    return succeeded == len(companies)
+
+def positive_int(value):
+    """argparse type for options that need a count of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate company factsheets from web data using AI",
@@ -89,6 +127,7 @@ def main():
 Examples:
   python src/main.py --url https://company.com/
   python src/main.py --csv companies.csv --select 0
+  python src/main.py --csv companies.csv --batch
   python src/main.py --url https://company.com/ --model gpt-4o-mini
         """
     )
@@ -100,6 +139,8 @@ Examples:
                            help='CSV file containing company URLs')
     
     parser.add_argument('--select', type=int, help='Select specific company index from CSV (0-based)')
+    parser.add_argument('--batch', action='store_true', help='Process all companies from CSV in parallel')
+    parser.add_argument('--workers', type=positive_int, default=8, help='Number of parallel workers for --batch')
     parser.add_argument('--output-dir', type=str, default='factsheets', 
                        help='Output directory for factsheet files')
     parser.add_argument('--model', type=str, help='OpenAI model to use (e.g., gpt-4o-mini, gpt-4o)')
@@ -126,27 +167,32 @@ Examples:
     if args.csv:
         companies = load_companies(args.csv)
         if not companies:
-            logger.error(f"No companies loaded from {args.csv}")
+            logger.error("No companies loaded from %s", args.csv)
             return 1
         
-        logger.info(f"Loaded {len(companies)} companies from {args.csv}")
+        logger.info("Loaded %d companies from %s", len(companies), args.csv)
+        
+        if args.batch:
+            success = generate_factsheets_batch(
+                companies, args.output_dir, args.model, args.workers)
+            return 0 if success else 1
         
         if args.select is not None:
             if 0 <= args.select < len(companies):
                 company = companies[args.select]
-                logger.info(f"Processing selected company {args.select}: {company['url']}")
+                logger.info("Processing selected company %d: %s", args.select, company['url'])
                 success = generate_factsheet_for_company(
                     company['url'], args.output_dir, args.model)
                 return 0 if success else 1
             else:
-                logger.error(f"Invalid selection {args.select}. Available indices: 0-{len(companies)-1}")
+                logger.error("Invalid selection %d. Available indices: 0-%d", args.select, len(companies) - 1)
                 return 1
         else:
             # List companies for selection
             logger.info("Available companies:")
             for i, company in enumerate(companies):
-                logger.info(f"  {i}: {company['url']} ({company['industry']})")
-            logger.info("Use --select <index> to process a specific company")
+                logger.info("  %d: %s (%s)", i, company['url'], company['industry'])
+            logger.info("Use --select <index> to process a specific company, or --batch to process all")
             return 0
 
 if __name__ == "__main__":
@@ -1,52 +1,55 @@
 """Data models for the factsheet generator"""
 
-from pydantic import BaseModel, Field, validator
-from typing import Dict, Optional
+from dataclasses import dataclass, field
 import re
 
-class PageData(BaseModel):
+# Filename cleaning patterns, compiled once
+_CLEAN_RE = re.compile(r'[^\w\s-]')
+_DASH_RE = re.compile(r'[-\s]+')
+
+def clean_filename(name) -> str:
+    """Turn an arbitrary title into a safe .md filename"""
+    if not name:
+        return "factsheet.md"
+    
+    # Clean filename
+    clean_name = str(name).lower()
+    clean_name = _CLEAN_RE.sub('', clean_name)
+    clean_name = _DASH_RE.sub('-', clean_name)
+    clean_name = clean_name.strip('-')
+    
+    if not clean_name.endswith('.md'):
+        clean_name += '.md'
+        
+    return clean_name or "factsheet.md"
+
+@dataclass(slots=True)
+class PageData:
     """Model for scraped page data"""
     title: str = ""
     description: str = ""
     content: str = ""
     success: bool = False
 
-class CompanyData(BaseModel):
+@dataclass(slots=True)
+class CompanyData:
     """Model for complete company data"""
     url: str
-    homepage: PageData = Field(default_factory=PageData)
-    about: PageData = Field(default_factory=PageData) 
+    homepage: PageData = field(default_factory=PageData)
+    about: PageData = field(default_factory=PageData)
     success: bool = False
     
-    @validator('url')
-    def validate_url(cls, v):
-        if not v.startswith(('http://', 'https://')):
+    def __post_init__(self):
+        if not self.url.startswith(('http://', 'https://')):
             raise ValueError('URL must start with http:// or https://')
-        return v
 
-class FactsheetOutput(BaseModel):
+@dataclass(slots=True)
+class FactsheetOutput:
     """Model for factsheet output with cleaning"""
     content: str
     filename: str
     word_count: int = 0
     
-    @validator('filename', pre=True)
-    def clean_filename(cls, v):
-        if not v:
-            return "factsheet.md"
-        
-        # Clean filename
-        clean_name = str(v).lower()
-        clean_name = re.sub(r'[^\w\s-]', '', clean_name)
-        clean_name = re.sub(r'[-\s]+', '-', clean_name)
-        clean_name = clean_name.strip('-')
-        
-        if not clean_name.endswith('.md'):
-            clean_name += '.md'
-            
-        return clean_name or "factsheet.md"
-    
-    @validator('word_count', always=True)
-    def calculate_word_count(cls, v, values):
-        content = values.get('content', '')
-        return len(str(content).split()) if content else 0
\ No newline at end of file
+    def __post_init__(self):
+        self.filename = clean_filename(self.filename)
+        self.word_count = len(str(self.content).split()) if self.content else 0
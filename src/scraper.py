@@ -5,68 +5,207 @@ Extracts content from company websites including homepage and about pages
 for factsheet generation.
 """
 
+import codecs
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from collections import OrderedDict
+from urllib.parse import urljoin, urlparse
+import itertools
+import re
+import threading
 import time
 from logger import logger
 
-def find_about_page(base_url, soup):
+# Shared session so homepage/about fetches (and batch runs) reuse connections
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
+# Be respectful with requests: at most one request per second to the same host
+_HOST_INTERVAL = 1.0
+_last_fetch = {}
+_last_fetch_lock = threading.Lock()
+
+def _wait_for_host(url):
+    """Sleep only as long as needed to keep the per-host request interval"""
+    host = urlparse(url).netloc
+    with _last_fetch_lock:
+        now = time.monotonic()
+        start = max(now, _last_fetch.get(host, 0.0) + _HOST_INTERVAL)
+        _last_fetch[host] = start
+    if start > now:
+        time.sleep(start - now)
+
+def host_delay(url):
+    """Seconds until the per-host request interval lets the next request to this host start"""
+    host = urlparse(url).netloc
+    with _last_fetch_lock:
+        return max(0.0, _last_fetch.get(host, 0.0) + _HOST_INTERVAL - time.monotonic())
+
+# Successful scrapes kept in-process, keyed by URL (LRU with a TTL)
+SCRAPE_CACHE_SIZE = 256
+SCRAPE_CACHE_TTL = 3600
+_scrape_cache = OrderedDict()
+_scrape_cache_lock = threading.Lock()
+
+# Links that likely point at an About page ('about' also covers 'about-us')
+_ABOUT_RE = re.compile(r'about|company|our-story', re.IGNORECASE)
+
+# XPath lookups compiled once and shared by every page (and batch run)
+_LINKS_XPATH = etree.XPath('//a[@href]')
+_META_DESCRIPTION_XPATH = etree.XPath('//meta[@name="description"]/@content')
+
+# Limit content length kept per page, and how much of a page is downloaded
+MAX_CONTENT_CHARS = 3000
+MAX_PAGE_BYTES = 1024 * 1024
+
+def _extract_text(root, limit):
+    """Join the page's stripped strings, stopping once `limit` characters are collected"""
+    parts = []
+    length = 0
+    for text in root.itertext():
+        text = text.strip()
+        if not text:
+            continue
+        parts.append(text)
+        length += len(text) + 1
+        if length >= limit:
+            break
+    return ' '.join(parts)[:limit]
+
+def find_about_page(base_url, root):
     """Try to find the About page URL"""
-    about_patterns = ['about', 'about-us', 'company', 'our-story']
-    
-    for link in soup.find_all('a', href=True):
-        href = link.get('href', '').lower()
-        link_text = link.get_text().lower().strip()
+    for link in _LINKS_XPATH(root):
+        href = link.get('href', '')
         
-        for pattern in about_patterns:
-            if pattern in href or pattern in link_text:
-                return urljoin(base_url, link.get('href'))
+        # Check the href first; only build the link text when it didn't match
+        if _ABOUT_RE.search(href) or _ABOUT_RE.search(link.text_content()):
+            return urljoin(base_url, href)
     return None
 
+def _declared_charset(response):
+    """Charset named in the Content-Type header, or None when the header doesn't give one"""
+    # response.encoding alone can't tell: requests assumes ISO-8859-1 for any text/*
+    # without a charset, which would override the page's own <meta charset>
+    if 'charset' not in response.headers.get('content-type', '').lower():
+        return None
+    try:
+        return codecs.lookup(response.encoding).name
+    except (LookupError, TypeError):
+        return None
+
+def _empty_document():
+    """Stand-in tree for a page with no markup: an empty page, not a failed scrape"""
+    return lxml.html.document_fromstring('<html><body></body></html>')
+
+def _fetch_html(url):
+    """Stream a page into lxml chunk by chunk, stopping at MAX_PAGE_BYTES"""
+    with _SESSION.get(url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        
+        chunks = response.iter_content(chunk_size=16 * 1024)
+        first = next(chunks, b'')
+        if not first:
+            return _empty_document()
+        
+        # libxml2 only sees the bytes, so pass on the charset from the HTTP header. Without
+        # one, let a <meta charset> (required near the top) decide, else assume UTF-8
+        # rather than libxml2's Latin-1 default.
+        encoding = _declared_charset(response)
+        if encoding is None and b'charset' not in first[:4096].lower():
+            encoding = 'utf-8'
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        
+        received = 0
+        for chunk in itertools.chain((first,), chunks):
+            parser.feed(chunk)
+            received += len(chunk)
+            if received >= MAX_PAGE_BYTES:
+                break
+    
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        root = None
+    # Blank or comment-only pages parse to nothing
+    return root if root is not None else _empty_document()
+
 def scrape_page(url):
     """Scrape a single page and extract content"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+    return _scrape_page_with_root(url)[0]
+
+def _scrape_page_with_root(url):
+    """Scrape a single page, returning the extracted data and the parsed HTML tree"""
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        _wait_for_host(url)
+        root = _fetch_html(url)
         
         # Extract key information
-        title = soup.find('title')
-        title_text = title.get_text().strip() if title else ""
+        title_text = (root.findtext('.//title') or "").strip()
         
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        description = meta_desc.get('content', '') if meta_desc else ""
+        meta_desc = _META_DESCRIPTION_XPATH(root)
+        description = meta_desc[0] if meta_desc else ""
         
-        # Remove script and style elements
-        for element in soup(['script', 'style']):
-            element.decompose()
+        # Remove script and style elements (and comments) in libxml2
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        etree.strip_tags(root, etree.Comment)
         
         # Extract main text content
-        body_text = soup.get_text(separator=' ', strip=True)
+        body_text = _extract_text(root, MAX_CONTENT_CHARS)
         
         return {
             'title': title_text,
             'description': description,
-            'content': body_text[:3000],  # Limit content length
+            'content': body_text,
             'success': True
-        }
+        }, root
     except Exception as e:
-        logger.error(f"Error scraping {url}: {str(e)}")
-        return {'success': False, 'error': str(e)}
+        logger.error("Error scraping %s: %s", url, e)
+        return {'success': False, 'error': str(e)}, None
 
-def scrape_company_data(url):
-    """Extract comprehensive company data from website"""
-    logger.info(f"Scraping company: {url}")
+def get_cached_scrape(url):
+    """Return a recent successful scrape of the same URL, if any"""
+    with _scrape_cache_lock:
+        cached = _scrape_cache.get(url)
+        if cached and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL:
+            _scrape_cache.move_to_end(url)
+            logger.info("Using cached scrape for: %s", url)
+            return _copy_scrape(cached[1])
+    return None
+
+def _copy_scrape(result):
+    """Copy of a scrape result down to its page dicts (their values are plain strings)"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
+
+def cache_scrape(url, result):
+    """Remember a successful scrape for SCRAPE_CACHE_TTL seconds"""
+    # Stored and handed out as copies, so callers mutating their result can't change the cache
+    entry = _copy_scrape(result)
+    with _scrape_cache_lock:
+        _scrape_cache[url] = (time.monotonic(), entry)
+        _scrape_cache.move_to_end(url)
+        while len(_scrape_cache) > SCRAPE_CACHE_SIZE:
+            _scrape_cache.popitem(last=False)
+
+def scrape_homepage(url):
+    """Scrape the homepage, returning the company data so far and the About page URL (or None)"""
+    logger.info("Scraping company: %s", url)
     
-    # Scrape homepage
-    homepage_data = scrape_page(url)
+    # The parsed tree is reused to look for the About link
+    homepage_data, root = _scrape_page_with_root(url)
     if not homepage_data['success']:
-        return {'url': url, 'success': False, 'error': homepage_data['error']}
+        return {'url': url, 'success': False, 'error': homepage_data['error']}, None
     
     result = {
         'url': url,
@@ -75,19 +214,38 @@ def scrape_company_data(url):
         'success': True
     }
     
-    # Try to find and scrape About page
+    about_url = None
     try:
-        soup = BeautifulSoup(requests.get(url).content, 'html.parser')
-        about_url = find_about_page(url, soup)
-        
+        about_url = find_about_page(url, root)
         if about_url:
-            logger.info(f"Found about page: {about_url}")
-            time.sleep(1)  # Be respectful with requests
-            about_data = scrape_page(about_url)
-            if about_data['success']:
-                result['about'] = about_data
-        
+            logger.info("Found about page: %s", about_url)
+    except Exception as e:
+        logger.warning("Could not find about page: %s", e)
+    
+    return result, about_url
+
+def scrape_about(about_url):
+    """Scrape the About page, returning its data or {} if it could not be scraped"""
+    try:
+        about_data = scrape_page(about_url)
+        if about_data['success']:
+            return about_data
     except Exception as e:
-        logger.warning(f"Could not scrape about page: {str(e)}")
+        logger.warning("Could not scrape about page: %s", e)
+    return {}
+
+def scrape_company_data(url):
+    """Extract comprehensive company data from website"""
+    cached = get_cached_scrape(url)
+    if cached is not None:
+        return cached
+    
+    result, about_url = scrape_homepage(url)
+    if not result['success']:
+        return result
+    
+    if about_url:
+        result['about'] = scrape_about(about_url)
     
-    return result
\ No newline at end of file
+    cache_scrape(url, result)
+    return result
@@ -4,20 +4,165 @@ AI Synthesis Module
 Generates business intelligence factsheets using OpenAI GPT models.
 """
 
+import hashlib
+import json
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from logger import logger
 
 load_dotenv()
 
+# Extra retries give the SDK's exponential backoff room on rate limits
+MAX_RETRIES = 5
+
+SYSTEM_PROMPT = "You are a business analyst creating concise, evidence-based sales intelligence factsheets. Only use information directly stated in the provided content."
+
+# Hard ceiling on output length (~900 words plus markdown), the main driver of latency
+MAX_OUTPUT_TOKENS = 1400
+
+@lru_cache(maxsize=1)
+def _load_template():
+    """Read the factsheet template once per process"""
+    template_path = Path(__file__).parent / "factsheet_template.md"
+    try:
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception:
+        logger.warning("Could not load factsheet template, using fallback")
+        return "# [Company Name] - Sales Intelligence Factsheet\n\n[Use template structure]"
+
+# Exact model IDs that get predicted outputs (the template's fixed headings). The API
+# rejects an output cap alongside a prediction, so these trade MAX_OUTPUT_TOKENS for the
+# prediction speed-up. The default gpt-4o-mini and the fast tier keep the hard cap.
+PREDICTED_OUTPUT_MODELS = frozenset({
+    "gpt-4o", "gpt-4o-2024-08-06", "gpt-4o-2024-11-20",
+    "gpt-4.1", "gpt-4.1-2025-04-14",
+})
+_PLACEHOLDER_RE = re.compile(r'\[[^\]]*\]')
+
+@lru_cache(maxsize=1)
+def _predicted_skeleton():
+    """Template with the bracketed instructions removed, i.e. the text every factsheet shares"""
+    return _PLACEHOLDER_RE.sub('', _load_template())
+
+@lru_cache(maxsize=1)
+def _static_prompt_prefix():
+    """Company-independent part of the prompt, kept byte-identical across calls"""
+    template_content = _load_template()
+    return f"""Create a sales intelligence factsheet using the website content provided at the end. Extract specific, actionable information.
+
+Follow this template exactly:
+{template_content}
+
+CRITICAL RULES:
+1. Use SPECIFIC information from the website content
+2. NO placeholder text like "[Target Market]" or generic templates
+3. NO generic conversation starters - make them specific to this company
+4. Extract actual company details, not industry generics
+5. Keep responses concise but informative
+6. Stay under 900 words in total
+
+SMART EXTRACTION:
+- Mission: Look for taglines, "About" messaging, company purpose statements
+- Business Model: Infer from pricing, products, how they operate
+- Pain Points: What problems do their solutions specifically solve?
+- Conversation Starters: Based on their actual products/services
+
+EXAMPLES:
+✅ GOOD: "How are you currently handling international payment processing?" (for Stripe)
+✅ GOOD: "Mission: Increase the GDP of the internet" (Stripe's actual tagline)
+❌ BAD: "Are you looking for [service] solutions?" (generic template)
+❌ BAD: "[Target Market] companies" (placeholder)
+
+Only use fallback phrases when information is genuinely not extractable from content."""
+
+# Generated factsheets keyed by a hash of the full request (LRU with a TTL)
+RESPONSE_CACHE_SIZE = 128
+RESPONSE_CACHE_TTL = 24 * 3600
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _response_cache_key(request):
+    """Stable key for a chat completion request (model, messages and sampling settings)"""
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _get_cached_response(key):
+    """Return a cached factsheet for an identical earlier request, if still fresh"""
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < RESPONSE_CACHE_TTL:
+            _response_cache.move_to_end(key)
+            logger.info("Using cached factsheet for identical prompt")
+            return cached[1]
+    return None
+
+def _store_response(key, factsheet):
+    """Cache a successfully generated factsheet"""
+    if not factsheet:
+        return
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), factsheet)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+def lookup_cached_factsheets(requests):
+    """Look up several chat requests at once, e.g. before submitting a Batch API job
+    
+    Returns (cache_key, factsheet or None) per request, in order.
+    """
+    keys = [_response_cache_key(request) for request in requests]
+    return [(key, _get_cached_response(key)) for key in keys]
+
+def store_cached_factsheet(cache_key, factsheet):
+    """Cache a factsheet produced outside the synthesizer, e.g. by a Batch API job"""
+    _store_response(cache_key, factsheet)
+
+# Output cleanup: stray code fences, whitespace at line edges, and factsheet title lines
+# (with their preceding newline, so later duplicates can be cut out)
+_CODE_FENCE_RE = re.compile(r'```(?:markdown)?')
+_LINE_EDGE_SPACE_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+_TITLE_LINE_RE = re.compile(r'(?:^|\n)# [^\n]*Sales Intelligence Factsheet[^\n]*')
+
+# Latency-vs-quality routing for the "fast" tier: sparse pages go to a small model
+TIERS = ("standard", "fast", "flex")
+FAST_MODEL = "gpt-4o-mini"
+SPARSE_CONTENT_CHARS = 2000
+
+@lru_cache(maxsize=None)
+def _openai_clients(api_key):
+    """Sync and async OpenAI clients shared by every synthesizer, so connections are reused"""
+    return OpenAI(api_key=api_key, max_retries=MAX_RETRIES), AsyncOpenAI(api_key=api_key, max_retries=MAX_RETRIES)
+
+async def close_clients():
+    """Close the shared OpenAI clients (call on application shutdown)"""
+    if not _openai_clients.cache_info().currsize:
+        return
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key:
+        client, async_client = _openai_clients(api_key)
+        client.close()
+        await async_client.close()
+    _openai_clients.cache_clear()
+    _cached_synthesizer.cache_clear()
+
 class FactsheetSynthesizer:
-    def __init__(self, model=None):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = model or "gpt-4o-mini"
-        if not os.getenv("OPENAI_API_KEY"):
+    def __init__(self, model=None, tier="standard"):
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
+        self.client, self.async_client = _openai_clients(api_key)
+        self.model = model or "gpt-4o-mini"
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier '{tier}', expected one of {', '.join(TIERS)}")
+        self.tier = tier
     
     def create_synthesis_prompt(self, company_data):
         """Create a structured prompt for factsheet generation with anti-hallucination safeguards"""
@@ -25,15 +170,6 @@ class FactsheetSynthesizer:
         about = company_data.get('about', {})
         url = company_data.get('url', '')
         
-        # Load the template
-        template_path = Path(__file__).parent / "factsheet_template.md"
-        try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-        except Exception:
-            logger.warning("Could not load factsheet template, using fallback")
-            template_content = "# [Company Name] - Sales Intelligence Factsheet\n\n[Use template structure]"
-        
         # Combine available content
         content_parts = []
         
@@ -51,37 +187,11 @@ class FactsheetSynthesizer:
         
         content_text = "\n\n".join(content_parts)
         
-        prompt = f"""Create a sales intelligence factsheet using the website content provided. Extract specific, actionable information.
+        # Static instructions first so OpenAI's prefix cache can match them across calls
+        return f"""{_static_prompt_prefix()}
 
 Website: {url}
-Content: {content_text}
-
-Follow this template exactly:
-{template_content}
-
-CRITICAL RULES:
-1. Use SPECIFIC information from the website content
-2. NO placeholder text like "[Target Market]" or generic templates
-3. NO generic conversation starters - make them specific to this company
-4. Extract actual company details, not industry generics
-5. Keep responses concise but informative
-6. Target 800-900 words total only. Should not exceed this limit at any cost
-
-SMART EXTRACTION:
-- Mission: Look for taglines, "About" messaging, company purpose statements
-- Business Model: Infer from pricing, products, how they operate
-- Pain Points: What problems do their solutions specifically solve?
-- Conversation Starters: Based on their actual products/services
-
-EXAMPLES:
-✅ GOOD: "How are you currently handling international payment processing?" (for Stripe)
-✅ GOOD: "Mission: Increase the GDP of the internet" (Stripe's actual tagline)
-❌ BAD: "Are you looking for [service] solutions?" (generic template)
-❌ BAD: "[Target Market] companies" (placeholder)
-
-Only use fallback phrases when information is genuinely not extractable from content."""
-
-        return prompt
+Content: {content_text}"""
     
     def generate_factsheet(self, company_data):
         """Generate factsheet using OpenAI"""
@@ -90,34 +200,134 @@ Only use fallback phrases when information is genuinely not extractable from con
             
             logger.info(f"Generating factsheet for {company_data.get('url')} using OpenAI")
             
-            return self._generate_with_openai(prompt)
+            return self._generate_with_openai(prompt, self._select_model(company_data))
                 
         except Exception as e:
             logger.error(f"Error generating factsheet: {str(e)}")
             return None
     
-    def _generate_with_openai(self, prompt):
-        """Generate factsheet using OpenAI with evidence-based approach"""
-        # Prepare request parameters
+    async def agenerate_factsheet(self, company_data):
+        """Generate factsheet using OpenAI without blocking the event loop"""
+        try:
+            prompt = self.create_synthesis_prompt(company_data)
+            
+            logger.info(f"Generating factsheet for {company_data.get('url')} using OpenAI")
+            
+            return await self._agenerate_with_openai(prompt, self._select_model(company_data))
+                
+        except Exception as e:
+            logger.error(f"Error generating factsheet: {str(e)}")
+            return None
+    
+    async def astream_factsheet(self, company_data):
+        """Yield the factsheet as raw text deltas while OpenAI generates it"""
+        prompt = self.create_synthesis_prompt(company_data)
+        request = self._build_request(prompt, self._select_model(company_data))
+        cache_key = _response_cache_key(request)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        logger.info(f"Streaming factsheet for {company_data.get('url')} using OpenAI")
+        
+        parts = []
+        stream = await self.async_client.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        _store_response(cache_key, self.finalize_factsheet("".join(parts)))
+    
+    def build_chat_request(self, company_data):
+        """Chat completion body for company data, e.g. one line of an OpenAI Batch API job"""
+        # No model routing here: every request in a batch file must use the same model
+        return self._build_request(self.create_synthesis_prompt(company_data))
+    
+    def finalize_factsheet(self, content):
+        """Clean raw model output into the final factsheet markdown"""
+        factsheet = content.strip() if content else ""
+        return self._clean_factsheet_output(factsheet)
+    
+    def _select_model(self, company_data):
+        """Pick the model for this company under the synthesizer's tier"""
+        if self.tier != "fast":
+            return self.model
+        
+        homepage = company_data.get('homepage', {})
+        about = company_data.get('about', {})
+        content_length = len(homepage.get('content', '')[:1500]) + len(about.get('content', '')[:1500])
+        return FAST_MODEL if content_length < SPARSE_CONTENT_CHARS else self.model
+    
+    def _build_request(self, prompt, model=None):
+        """Build the chat completion request parameters"""
+        model = model or self.model
         kwargs = {
-            "model": self.model,
+            "model": model,
             "messages": [
-                {"role": "system", "content": "You are a business analyst creating evidence-based sales intelligence factsheets. Only use information directly stated in the provided content."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ]
         }
         
-        # Add temperature setting for compatible models
-        if "gpt-5" not in self.model.lower():
+        # Add temperature and output cap for compatible models. gpt-5 models spend
+        # max_completion_tokens on hidden reasoning too, so a tight cap could truncate them.
+        if "gpt-5" not in model.lower():
             kwargs["temperature"] = 0.2
-            
-        response = self.client.chat.completions.create(**kwargs)
+            kwargs["max_tokens"] = MAX_OUTPUT_TOKENS
         
-        content = response.choices[0].message.content
-        factsheet = content.strip() if content else ""
-        factsheet = self._clean_factsheet_output(factsheet)
+        # Predicted outputs let the fixed headings be accepted instead of decoded token by
+        # token. Matched exactly: a prefix match would also catch gpt-4o-mini and drop its
+        # cap. For the listed models the prompt's length rule bounds the output instead.
+        if model.lower() in PREDICTED_OUTPUT_MODELS:
+            kwargs["prediction"] = {"type": "content", "content": _predicted_skeleton()}
+            kwargs.pop("max_tokens", None)
+        
+        # Flex processing trades latency for cost; only some model families accept it
+        if self.tier == "flex" and model.lower().startswith(("gpt-5", "o3", "o4-mini")):
+            kwargs["service_tier"] = "flex"
+        
+        return kwargs
+    
+    def _generate_with_openai(self, prompt, model=None):
+        """Generate factsheet using OpenAI with evidence-based approach"""
+        request = self._build_request(prompt, model)
+        cache_key = _response_cache_key(request)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = self.client.chat.completions.create(**request)
+        factsheet = self._process_response(response)
+        _store_response(cache_key, factsheet)
+        return factsheet
+    
+    async def _agenerate_with_openai(self, prompt, model=None):
+        """Async variant of _generate_with_openai"""
+        request = self._build_request(prompt, model)
+        cache_key = _response_cache_key(request)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = await self.async_client.chat.completions.create(**request)
+        factsheet = self._process_response(response)
+        _store_response(cache_key, factsheet)
+        return factsheet
+    
+    def _process_response(self, response):
+        """Extract and clean the factsheet from a chat completion response"""
+        factsheet = self.finalize_factsheet(response.choices[0].message.content)
         word_count = len(factsheet.split())
-        logger.info(f"Generated factsheet with {word_count} words using OpenAI")
+        usage = getattr(response, 'usage', None)
+        if usage:
+            logger.info(f"Generated factsheet with {word_count} words ({usage.completion_tokens} completion tokens) using OpenAI")
+        else:
+            logger.info(f"Generated factsheet with {word_count} words using OpenAI")
         return factsheet
     
     
@@ -126,34 +336,33 @@ Only use fallback phrases when information is genuinely not extractable from con
         if not factsheet:
             return factsheet
             
-        # Remove markdown code block markers that shouldn't be there
-        factsheet = factsheet.replace('```markdown', '').replace('```', '')
-        
-        # Remove any leading/trailing whitespace
-        factsheet = factsheet.strip()
+        # Remove markdown code block markers and surrounding/per-line whitespace
+        factsheet = _CODE_FENCE_RE.sub('', factsheet).strip()
+        factsheet = _LINE_EDGE_SPACE_RE.sub('', factsheet)
         
         # Ensure proper title format (remove any duplicate titles)
-        lines = factsheet.split('\n')
-        cleaned_lines = []
-        title_found = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                cleaned_lines.append('')
-                continue
-                
-            # Skip duplicate titles after the first one
-            if line.startswith('# ') and 'Sales Intelligence Factsheet' in line:
-                if title_found:
-                    continue
-                title_found = True
-            
-            cleaned_lines.append(line)
+        titles = list(_TITLE_LINE_RE.finditer(factsheet))
+        if len(titles) <= 1:
+            return factsheet
         
-        return '\n'.join(cleaned_lines)
+        parts = [factsheet[:titles[1].start()]]
+        for current, following in zip(titles[1:], titles[2:] + [None]):
+            parts.append(factsheet[current.end():following.start() if following else None])
+        return ''.join(parts)
 
-def create_factsheet(company_data, model=None):
+def get_synthesizer(model=None, tier="standard"):
+    """Shared synthesizer per (model, tier) instead of one per request"""
+    # Normalise the arguments so keyword and positional calls share a cache entry
+    return _cached_synthesizer(model, tier)
+
+@lru_cache(maxsize=8)
+def _cached_synthesizer(model, tier):
+    return FactsheetSynthesizer(model=model, tier=tier)
+
+def create_factsheet(company_data, model=None, tier="standard"):
     """Main function to create factsheet from company data"""
-    synthesizer = FactsheetSynthesizer(model=model)
-    return synthesizer.generate_factsheet(company_data)
\ No newline at end of file
+    return get_synthesizer(model, tier).generate_factsheet(company_data)
+
+async def create_factsheet_async(company_data, model=None, tier="standard"):
+    """Async version of create_factsheet for the web backend"""
+    return await get_synthesizer(model, tier).agenerate_factsheet(company_data)
\ No newline at end of file
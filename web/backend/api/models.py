@@ -1,21 +1,60 @@
 """API models for the web interface"""
 
-from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
 
 class GenerateRequest(BaseModel):
     """Request model for factsheet generation"""
     url: HttpUrl = Field(..., description="Company website URL to analyze")
     model: Optional[str] = Field(None, description="Specific OpenAI model to use")
+    tier: Literal["standard", "fast", "flex"] = Field(
+        "standard", description="standard: use the model as given, fast: route sparse pages to a smaller model, flex: flex processing where supported"
+    )
 
 class GenerateResponse(BaseModel):
     """Response model for factsheet generation"""
     task_id: str = Field(..., description="Task ID for tracking generation progress")
     message: str = Field(..., description="Response message")
 
+class BulkGenerateRequest(BaseModel):
+    """Request model for generating factsheets for several companies"""
+    urls: List[HttpUrl] = Field(..., min_length=1, description="Company website URLs to analyze")
+    model: Optional[str] = Field(None, description="Specific OpenAI model to use")
+    tier: Literal["standard", "fast", "flex"] = Field(
+        "standard", description="Same as GenerateRequest.tier; ignored by /batch-generate"
+    )
+
+class BulkGenerateResponse(BaseModel):
+    """Response model for bulk factsheet generation"""
+    task_ids: List[str] = Field(..., description="One task ID per URL, in request order")
+    message: str = Field(..., description="Response message")
+
+class BatchGenerateResponse(BaseModel):
+    """Response model for an OpenAI Batch API submission"""
+    batch_id: Optional[str] = Field(None, description="Batch ID for tracking the job, None if every factsheet was cached")
+    status: str = Field(..., description="OpenAI batch status")
+    total: int = Field(..., description="Number of factsheets submitted")
+    skipped: List[str] = Field(default_factory=list, description="URLs that could not be scraped")
+    cached: List[str] = Field(default_factory=list, description="Factsheets saved straight from the response cache")
+    message: str = Field(..., description="Response message")
+
+class BatchStatus(BaseModel):
+    """Batch job status response"""
+    batch_id: str
+    status: str = Field(..., description="validating, in_progress, finalizing, completed, failed, expired, cancelled")
+    total: int = Field(0, description="Number of requests in the batch")
+    completed: int = Field(0, description="Requests completed so far")
+    failed: int = Field(0, description="Requests that failed")
+    filenames: List[str] = Field(default_factory=list, description="Factsheets saved once the batch completed")
+
+# Stored task state is immutable; updates go through model_copy
+_FROZEN_RESPONSE = ConfigDict(frozen=True)
+
 class TaskStatus(BaseModel):
     """Task status response"""
+    model_config = _FROZEN_RESPONSE
+    
     task_id: str
     status: str = Field(..., description="pending, processing, completed, failed")
     progress: int = Field(0, description="Progress percentage (0-100)")
@@ -25,6 +64,8 @@ class TaskStatus(BaseModel):
 
 class FactsheetMetadata(BaseModel):
     """Factsheet metadata"""
+    model_config = _FROZEN_RESPONSE
+    
     filename: str
     company_name: str
     url: str
@@ -34,11 +75,40 @@ class FactsheetMetadata(BaseModel):
 
 class FactsheetListResponse(BaseModel):
     """Response for listing factsheets"""
+    model_config = _FROZEN_RESPONSE
+    
     factsheets: List[FactsheetMetadata]
     total: int
     
+class HistogramBins(BaseModel):
+    """Pre-binned histogram: counts[i] covers edges[i] to edges[i + 1]"""
+    edges: List[float]
+    counts: List[int]
+
+class DailyCount(BaseModel):
+    """Number of factsheets created on one day"""
+    date: str = Field(..., description="YYYY-MM-DD (server local time)")
+    count: int
+
+class FactsheetStats(BaseModel):
+    """Dashboard aggregates over all factsheets"""
+    total: int
+    avg_words: float = Field(..., description="Mean word count")
+    total_size: int = Field(..., description="Combined file size in bytes")
+    today_count: int = Field(..., description="Factsheets created today (server local time)")
+    word_count_histogram: Optional[HistogramBins] = Field(None, description="10 equal-width word count bins")
+    daily_counts: List[DailyCount] = Field(default_factory=list, description="Factsheets created per day, oldest first")
+
 class FactsheetContent(BaseModel):
     """Full factsheet content"""
     metadata: FactsheetMetadata
     content: str
 
+class MessageResponse(BaseModel):
+    """Generic response carrying a single message"""
+    message: str
+
+class HealthResponse(BaseModel):
+    """Health check response"""
+    status: str
+    timestamp: datetime
@@ -1,74 +1,117 @@
 """API routes for the factsheet generator web interface"""
 
+import asyncio
+import hashlib
+import json
 import os
+import re
 import uuid
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import HttpUrl
 import aiofiles
 
+from .tasks import create_task_store
 from .models import (
-    GenerateRequest, GenerateResponse, TaskStatus, 
-    FactsheetMetadata, FactsheetListResponse, FactsheetContent
+    GenerateRequest, GenerateResponse, BulkGenerateRequest, BulkGenerateResponse,
+    BatchGenerateResponse, BatchStatus,
+    TaskStatus, FactsheetMetadata, FactsheetListResponse, FactsheetContent,
+    FactsheetStats, HistogramBins, DailyCount,
+    MessageResponse, HealthResponse
 )
 
 # Import existing components
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
 sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
-from src.scraper import scrape_company_data
-from src.synthesizer import create_factsheet
+from src.scraper import (
+    cache_scrape, get_cached_scrape, host_delay, scrape_about, scrape_company_data, scrape_homepage
+)
+from src.synthesizer import (
+    create_factsheet_async, get_synthesizer, lookup_cached_factsheets, store_cached_factsheet
+)
 from src.logger import logger
 from web.shared.utils import sanitize_filename
 
 router = APIRouter(prefix="/api", tags=["factsheets"])
 
-# In-memory task storage (in production, use Redis or similar)
-tasks: Dict[str, TaskStatus] = {}
+# Task status and submitted OpenAI Batch API jobs (model, per-request URL/title,
+# written files): Redis when REDIS_URL is set, otherwise in process memory
+task_store = create_task_store()
+
+# How long generation waits for the About page once its request can start. It shares
+# the homepage's host, so the per-host request interval is added on top of this. It is
+# optional, so a slow About page should not hold up the factsheet.
+ABOUT_PAGE_WAIT = 3.0
+
+# How often a task event stream re-reads the task store for changes
+TASK_EVENTS_INTERVAL = 0.25
+
+# Cap concurrent OpenAI calls to stay under rate limits
+MAX_CONCURRENT_GENERATIONS = 10
+generation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+# First URL on a line that mentions the website/company; markdown link targets take precedence
+_METADATA_URL_RE = re.compile(
+    r'^(?=(?i:[^\n]*(?:website|company)))[^\n]*?'
+    r'(?:\[(https?://[^\]]+)\]|\*\*Website:\*\*\s*\[(https?://[^\]]+)\]|(https?://[^\s\)\]]+))',
+    re.MULTILINE
+)
+
+# Parsed metadata per factsheet path, reused while (st_mtime_ns, st_size) is unchanged
+_metadata_cache: Dict[str, Tuple[Tuple[int, int], FactsheetMetadata]] = {}
 
 def get_factsheets_dir() -> Path:
     """Get the factsheets directory"""
     return Path("factsheets")
 
-def get_factsheet_metadata(filepath: Path) -> FactsheetMetadata:
+def _extract_metadata_from_content(content: str, filepath: Path, stats: os.stat_result) -> FactsheetMetadata:
+    """Build factsheet metadata from already-loaded content"""
+    # Extract company name from filename as primary source
+    filename_stem = filepath.stem  # e.g., "stripe" from "stripe.md"
+    company_name = filename_stem.capitalize()  # e.g., "Stripe"
+    
+    # Try to extract URL from content
+    url = "Unknown URL"
+    head = '\n'.join(content.split('\n', 20)[:20])
+    url_match = _METADATA_URL_RE.search(head)
+    if url_match:
+        # Get the first non-None group and clean up markdown formatting
+        url = next(group for group in url_match.groups() if group).rstrip('/')
+    
+    return FactsheetMetadata(
+        filename=filepath.name,
+        company_name=company_name,
+        url=url,
+        word_count=len(content.split()),
+        created_at=datetime.fromtimestamp(stats.st_mtime),
+        file_size=stats.st_size
+    )
+
+async def get_factsheet_metadata(filepath: Path) -> FactsheetMetadata:
     """Extract metadata from factsheet file"""
     try:
-        # Read content
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
+        # Only re-parse files that are new or changed since the last listing
+        stats = await asyncio.to_thread(filepath.stat)
+        cache_key = str(filepath)
+        version = (stats.st_mtime_ns, stats.st_size)
+        cached = _metadata_cache.get(cache_key)
+        if cached and cached[0] == version:
+            return cached[1]
         
-        # Extract company name from filename as primary source
-        filename_stem = filepath.stem  # e.g., "stripe" from "stripe.md"
-        company_name = filename_stem.capitalize()  # e.g., "Stripe"
-        
-        # Try to extract URL from content
-        url = "Unknown URL"
-        for line in lines[:20]:
-            if 'http' in line and ('website' in line.lower() or 'company' in line.lower()):
-                import re
-                # Try to match markdown link format [text](url) or just url
-                url_match = re.search(r'\[(https?://[^\]]+)\]|\*\*Website:\*\*\s*\[(https?://[^\]]+)\]|https?://[^\s\)\]]+', line)
-                if url_match:
-                    # Get the first non-None group
-                    url = next(group for group in url_match.groups() if group) if url_match.groups() and any(url_match.groups()) else url_match.group()
-                    # Clean up markdown formatting
-                    url = url.rstrip('/')
-                    break
-        
-        stats = filepath.stat()
+        # Read content without blocking the event loop
+        async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+            content = await f.read()
         
-        return FactsheetMetadata(
-            filename=filepath.name,
-            company_name=company_name,
-            url=url,
-            word_count=len(content.split()),
-            created_at=datetime.fromtimestamp(stats.st_mtime),
-            file_size=stats.st_size
-        )
+        metadata = _extract_metadata_from_content(content, filepath, stats)
+        _metadata_cache[cache_key] = (version, metadata)
+        return metadata
     except Exception as e:
         logger.error(f"Error extracting metadata from {filepath}: {e}")
         return FactsheetMetadata(
@@ -77,71 +120,110 @@ def get_factsheet_metadata(filepath: Path) -> FactsheetMetadata:
             url="Unknown",
             word_count=0,
             created_at=datetime.now(),
-            file_size=filepath.stat().st_size
+            file_size=(await asyncio.to_thread(filepath.stat)).st_size
         )
 
-async def generate_factsheet_task(task_id: str, url: str, model: Optional[str]):
+async def save_factsheet(url: str, page_title: str, factsheet_content: str) -> Dict[str, Any]:
+    """Write a generated factsheet to disk and return its result summary"""
+    factsheets_dir = get_factsheets_dir()
+    factsheets_dir.mkdir(exist_ok=True)
+    
+    filename = sanitize_filename(page_title, url)
+    
+    # Extract clean company name from domain
+    from urllib.parse import urlparse
+    domain = urlparse(url).netloc
+    domain = domain.replace('www.', '').replace('app.', '').replace('api.', '')
+    company_name = domain.split('.')[0].capitalize()
+    
+    output_path = factsheets_dir / filename
+    
+    async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
+        await f.write(factsheet_content)
+    
+    return {
+        "filename": filename,
+        "path": str(output_path),
+        "word_count": len(factsheet_content.split()),
+        "company_name": company_name
+    }
+
+async def scrape_for_generation(url: str) -> Dict[str, Any]:
+    """Scrape a company, giving up on the About page ABOUT_PAGE_WAIT seconds after its request starts
+
+    A skipped About page is flagged with 'about_skipped' in the returned company data.
+    """
+    cached = get_cached_scrape(url)
+    if cached is not None:
+        return cached
+    
+    # Blocking I/O, keep it off the event loop
+    company_data, about_url = await run_in_threadpool(scrape_homepage, url)
+    if not company_data['success']:
+        return company_data
+    if not about_url:
+        cache_scrape(url, company_data)
+        return company_data
+    
+    # The About request waits out the host interval first; don't count that against it
+    about_wait = ABOUT_PAGE_WAIT + host_delay(about_url)
+    about_task = asyncio.ensure_future(run_in_threadpool(scrape_about, about_url))
+    
+    # Cache the complete scrape whenever the About page arrives, even after we moved on
+    def cache_complete(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is None:
+            cache_scrape(url, {**company_data, 'about': task.result()})
+    about_task.add_done_callback(cache_complete)
+    
+    try:
+        about = await asyncio.wait_for(asyncio.shield(about_task), timeout=about_wait)
+    except asyncio.TimeoutError:
+        logger.info(f"About page for {url} still loading, generating from the homepage only")
+        return {**company_data, 'about_skipped': True}
+    return {**company_data, 'about': about}
+
+async def generate_factsheet_task(task_id: str, url: str, model: Optional[str], tier: str = "standard"):
     """Background task to generate factsheet"""
     try:
-        tasks[task_id].status = "processing"
-        tasks[task_id].progress = 10
-        tasks[task_id].message = "Scraping company website..."
+        await task_store.update(task_id, status="processing", progress=10,
+                                message="Scraping company website...")
         
         # Step 1: Scrape company data
-        company_data = scrape_company_data(url)
+        company_data = await scrape_for_generation(url)
         
         if not company_data['success']:
-            tasks[task_id].status = "failed"
-            tasks[task_id].error = f"Failed to scrape data from {url}"
+            await task_store.update(task_id, status="failed",
+                                    error=f"Failed to scrape data from {url}")
             return
         
-        tasks[task_id].progress = 50
-        tasks[task_id].message = "Generating factsheet with OpenAI..."
+        await task_store.update(task_id, progress=50, message="Generating factsheet with OpenAI...")
         
         # Step 2: Generate factsheet
-        factsheet_content = create_factsheet(company_data, model=model)
+        async with generation_semaphore:
+            factsheet_content = await create_factsheet_async(company_data, model=model, tier=tier)
         
         if not factsheet_content:
-            tasks[task_id].status = "failed"
-            tasks[task_id].error = "Failed to generate factsheet content"
+            await task_store.update(task_id, status="failed",
+                                    error="Failed to generate factsheet content")
             return
         
-        tasks[task_id].progress = 80
-        tasks[task_id].message = "Saving factsheet..."
+        await task_store.update(task_id, progress=80, message="Saving factsheet...")
         
         # Step 3: Save factsheet
-        factsheets_dir = get_factsheets_dir()
-        factsheets_dir.mkdir(exist_ok=True)
-        
         page_title = company_data['homepage'].get('title', '')
-        filename = sanitize_filename(page_title, url)
-        
-        # Extract clean company name from domain
-        from urllib.parse import urlparse
-        domain = urlparse(url).netloc
-        domain = domain.replace('www.', '').replace('app.', '').replace('api.', '')
-        company_name = domain.split('.')[0].capitalize()
-        
-        output_path = factsheets_dir / filename
+        result = await save_factsheet(url, page_title, factsheet_content)
+        message = "Factsheet generated successfully"
+        if company_data.get('about_skipped'):
+            result['about_skipped'] = True
+            message += " (About page timed out, homepage only)"
         
-        async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-            await f.write(factsheet_content)
+        await task_store.update(task_id, status="completed", progress=100,
+                                message=message, result=result)
         
-        tasks[task_id].status = "completed"
-        tasks[task_id].progress = 100
-        tasks[task_id].message = "Factsheet generated successfully"
-        tasks[task_id].result = {
-            "filename": filename,
-            "path": str(output_path),
-            "word_count": len(factsheet_content.split()),
-            "company_name": company_name
-        }
-        
-        logger.info(f"Factsheet generated: {filename}")
+        logger.info(f"Factsheet generated: {result['filename']}")
         
     except Exception as e:
-        tasks[task_id].status = "failed"
-        tasks[task_id].error = str(e)
+        await task_store.update(task_id, status="failed", error=str(e))
         logger.error(f"Error in factsheet generation task {task_id}: {e}")
 
 @router.post("/generate", response_model=GenerateResponse)
@@ -150,19 +232,20 @@ async def generate_factsheet(request: GenerateRequest, background_tasks: Backgro
     task_id = str(uuid.uuid4())
     
     # Initialize task
-    tasks[task_id] = TaskStatus(
+    await task_store.set(TaskStatus(
         task_id=task_id,
         status="pending",
         progress=0,
         message="Task queued for processing"
-    )
+    ))
     
     # Start background task
     background_tasks.add_task(
         generate_factsheet_task,
         task_id,
         str(request.url),
-        request.model
+        request.model,
+        request.tier
     )
     
     return GenerateResponse(
@@ -170,40 +253,344 @@ async def generate_factsheet(request: GenerateRequest, background_tasks: Backgro
         message="Factsheet generation started"
     )
 
+@router.get("/generate/stream")
+async def stream_factsheet(url: HttpUrl, model: Optional[str] = None,
+                           tier: Literal["standard", "fast", "flex"] = "standard"):
+    """Generate a factsheet and stream it back as server-sent events"""
+    url = str(url)
+    
+    def event(payload: Dict[str, Any]) -> str:
+        return f"data: {json.dumps(payload)}\n\n"
+    
+    async def events():
+        try:
+            yield event({"status": "scraping", "message": "Scraping company website..."})
+            company_data = await scrape_for_generation(url)
+            if not company_data['success']:
+                yield event({"error": f"Failed to scrape data from {url}"})
+                return
+            
+            yield event({"status": "generating", "message": "Generating factsheet with OpenAI..."})
+            synthesizer = get_synthesizer(model, tier)
+            parts = []
+            async with generation_semaphore:
+                async for delta in synthesizer.astream_factsheet(company_data):
+                    parts.append(delta)
+                    yield event({"delta": delta})
+            
+            factsheet_content = synthesizer.finalize_factsheet("".join(parts))
+            if not factsheet_content:
+                yield event({"error": "Failed to generate factsheet content"})
+                return
+            
+            # Word count and metadata are computed once the full text has arrived
+            page_title = company_data['homepage'].get('title', '')
+            result = await save_factsheet(url, page_title, factsheet_content)
+            if company_data.get('about_skipped'):
+                result['about_skipped'] = True
+            logger.info(f"Factsheet generated: {result['filename']}")
+            yield event({"done": True, "result": result})
+        except Exception as e:
+            logger.error(f"Error streaming factsheet for {url}: {e}")
+            yield event({"error": str(e)})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@router.post("/bulk-generate", response_model=BulkGenerateResponse)
+async def bulk_generate_factsheets(request: BulkGenerateRequest, background_tasks: BackgroundTasks):
+    """Generate factsheets for several company URLs concurrently"""
+    task_ids = []
+    for _ in request.urls:
+        task_id = str(uuid.uuid4())
+        await task_store.set(TaskStatus(
+            task_id=task_id,
+            status="pending",
+            progress=0,
+            message="Task queued for processing"
+        ))
+        task_ids.append(task_id)
+    
+    async def run_all():
+        await asyncio.gather(*[
+            generate_factsheet_task(task_id, str(url), request.model, request.tier)
+            for task_id, url in zip(task_ids, request.urls)
+        ])
+    
+    background_tasks.add_task(run_all)
+    
+    return BulkGenerateResponse(
+        task_ids=task_ids,
+        message=f"Factsheet generation started for {len(task_ids)} companies"
+    )
+
+@router.post("/batch-generate", response_model=BatchGenerateResponse)
+async def batch_generate_factsheets(request: BulkGenerateRequest):
+    """Submit factsheet generation for several URLs as one OpenAI Batch API job"""
+    urls = [str(url) for url in request.urls]
+    scraped = await asyncio.gather(*[run_in_threadpool(scrape_company_data, url) for url in urls])
+    
+    synthesizer = get_synthesizer(request.model)
+    skipped = [url for url, company_data in zip(urls, scraped) if not company_data['success']]
+    pending = [
+        (index, url, company_data, synthesizer.build_chat_request(company_data))
+        for index, (url, company_data) in enumerate(zip(urls, scraped))
+        if company_data['success']
+    ]
+    if not pending:
+        raise HTTPException(status_code=422, detail="None of the URLs could be scraped")
+    
+    # Identical prompts answered before are saved right away instead of being resubmitted
+    cached_filenames = []
+    lines = []
+    jobs = {}
+    lookups = lookup_cached_factsheets([body for _, _, _, body in pending])
+    for (index, url, company_data, body), (cache_key, cached) in zip(pending, lookups):
+        title = company_data['homepage'].get('title', '')
+        if cached is not None:
+            result = await save_factsheet(url, title, cached)
+            cached_filenames.append(result["filename"])
+            continue
+        
+        custom_id = f"factsheet-{index}"
+        jobs[custom_id] = {"url": url, "title": title, "cache_key": cache_key}
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body
+        }))
+    
+    if not lines:
+        return BatchGenerateResponse(
+            batch_id=None,
+            status="completed",
+            total=0,
+            skipped=skipped,
+            cached=cached_filenames,
+            message=f"All {len(cached_filenames)} factsheets served from cache"
+        )
+    
+    try:
+        batch_file = await synthesizer.async_client.files.create(
+            file=("factsheets.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await synthesizer.async_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+    except Exception as e:
+        logger.error(f"Error submitting batch job: {e}")
+        raise HTTPException(status_code=502, detail="Error submitting batch job")
+    
+    await task_store.set_batch(batch.id, {"model": request.model, "jobs": jobs, "filenames": None})
+    logger.info(f"Submitted batch {batch.id} with {len(jobs)} factsheets")
+    
+    return BatchGenerateResponse(
+        batch_id=batch.id,
+        status=batch.status,
+        total=len(jobs),
+        skipped=skipped,
+        cached=cached_filenames,
+        message=f"Batch submitted for {len(jobs)} companies"
+    )
+
+@router.get("/batches/{batch_id}", response_model=BatchStatus)
+async def get_batch_status(batch_id: str):
+    """Get the status of a batch job, writing its factsheets once it has completed"""
+    job = await task_store.get_batch(batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    synthesizer = get_synthesizer(job["model"])
+    try:
+        batch = await synthesizer.async_client.batches.retrieve(batch_id)
+        
+        if batch.status == "completed" and job["filenames"] is None and batch.output_file_id:
+            output = await synthesizer.async_client.files.content(batch.output_file_id)
+            filenames = []
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                info = job["jobs"].get(record.get("custom_id"))
+                body = (record.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                if not info or not choices:
+                    continue
+                
+                factsheet_content = synthesizer.finalize_factsheet(choices[0]["message"]["content"])
+                if factsheet_content:
+                    store_cached_factsheet(info["cache_key"], factsheet_content)
+                    result = await save_factsheet(info["url"], info["title"], factsheet_content)
+                    filenames.append(result["filename"])
+            
+            job["filenames"] = filenames
+            await task_store.set_batch(batch_id, job)
+            logger.info(f"Batch {batch_id} completed: {len(filenames)} factsheets saved")
+    except Exception as e:
+        logger.error(f"Error checking batch {batch_id}: {e}")
+        raise HTTPException(status_code=502, detail="Error checking batch status")
+    
+    counts = batch.request_counts
+    return BatchStatus(
+        batch_id=batch_id,
+        status=batch.status,
+        total=counts.total if counts else len(job["jobs"]),
+        completed=counts.completed if counts else 0,
+        failed=counts.failed if counts else 0,
+        filenames=job["filenames"] or []
+    )
+
 @router.get("/tasks/{task_id}", response_model=TaskStatus)
 async def get_task_status(task_id: str):
     """Get the status of a factsheet generation task"""
-    if task_id not in tasks:
+    # Polled every few hundred ms per task: serve the stored JSON as-is
+    task_json = await task_store.get_json(task_id)
+    if task_json is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return tasks[task_id]
+    return Response(content=task_json, media_type="application/json")
 
-@router.get("/factsheets", response_model=FactsheetListResponse)
-async def list_factsheets():
-    """List all generated factsheets"""
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str):
+    """Push a task's status as server-sent events whenever it changes, until it finishes"""
+    task = await task_store.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    async def events():
+        current, last = task, None
+        # The store is read locally, so the client makes one request instead of polling
+        while current is not None:
+            if current != last:
+                yield f"data: {current.model_dump_json()}\n\n"
+                last = current
+            if current.status in ("completed", "failed"):
+                return
+            await asyncio.sleep(TASK_EVENTS_INTERVAL)
+            current = await task_store.get(task_id)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+async def collect_factsheets() -> List[FactsheetMetadata]:
+    """Metadata for every generated factsheet, newest first"""
     factsheets_dir = get_factsheets_dir()
     
     if not factsheets_dir.exists():
-        return FactsheetListResponse(factsheets=[], total=0)
+        return []
+    
+    # Read all factsheets concurrently instead of one blocking read at a time
+    paths = list(factsheets_dir.glob("*.md"))
+    results = await asyncio.gather(
+        *(get_factsheet_metadata(file_path) for file_path in paths),
+        return_exceptions=True
+    )
+    
+    # Drop cache entries for factsheets that no longer exist
+    for stale in _metadata_cache.keys() - {str(file_path) for file_path in paths}:
+        del _metadata_cache[stale]
     
     factsheets = []
-    for file_path in factsheets_dir.glob("*.md"):
-        try:
-            metadata = get_factsheet_metadata(file_path)
+    for file_path, metadata in zip(paths, results):
+        if isinstance(metadata, Exception):
+            logger.error(f"Error processing factsheet {file_path}: {metadata}")
+        else:
             factsheets.append(metadata)
-        except Exception as e:
-            logger.error(f"Error processing factsheet {file_path}: {e}")
     
     # Sort by creation date (newest first)
     factsheets.sort(key=lambda x: x.created_at, reverse=True)
+    return factsheets
+
+def _factsheets_fingerprint(*extra: str) -> str:
+    """ETag for the factsheets directory: changes whenever a file is added, removed or rewritten"""
+    digest = hashlib.md5()
+    for part in extra:
+        # Separated, so e.g. limit=1&offset=10 and limit=11&offset=0 differ
+        digest.update(part.encode() + b"\0")
+    try:
+        # Only directory entries are stat'ed; no factsheet is opened
+        entries = sorted(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in os.scandir(get_factsheets_dir())
+            if entry.name.endswith(".md")
+        )
+    except FileNotFoundError:
+        entries = []
+    for name, mtime_ns, size in entries:
+        digest.update(f"{name}:{mtime_ns}:{size};".encode())
+    return f'"{digest.hexdigest()}"'
+
+async def _not_modified(request: Request, response: Response, *extra: str) -> Optional[Response]:
+    """A 304 when the client's If-None-Match is still current; otherwise tag the response"""
+    etag = await asyncio.to_thread(_factsheets_fingerprint, *extra)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+@router.get("/factsheets", response_model=FactsheetListResponse)
+async def list_factsheets(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Return at most this many factsheets"),
+    offset: int = Query(0, ge=0, description="Skip this many factsheets (in sort order)"),
+    sort: Literal["-created_at", "created_at"] = Query("-created_at", description="Newest (-created_at) or oldest first")
+):
+    """List generated factsheets, newest first by default"""
+    # Unchanged directory: skip reading metadata and re-sending the listing. The page
+    # parameters are part of the tag, since each page is a different body.
+    not_modified = await _not_modified(request, response, str(limit), str(offset), sort)
+    if not_modified:
+        return not_modified
+    
+    factsheets = await collect_factsheets()
+    if sort == "created_at":
+        factsheets.reverse()
+    end = offset + limit if limit is not None else None
     
     return FactsheetListResponse(
-        factsheets=factsheets,
+        factsheets=factsheets[offset:end],
         total=len(factsheets)
     )
 
+def word_count_histogram(word_counts: List[int], bins: int = 10) -> HistogramBins:
+    """Equal-width histogram of word counts (the last bin includes the maximum)"""
+    low, high = min(word_counts), max(word_counts)
+    width = (high - low) / bins or 1
+    counts = [0] * bins
+    for words in word_counts:
+        counts[min(int((words - low) / width), bins - 1)] += 1
+    return HistogramBins(edges=[low + i * width for i in range(bins + 1)], counts=counts)
+
+@router.get("/stats", response_model=FactsheetStats)
+async def get_factsheet_stats(request: Request, response: Response):
+    """Aggregate numbers and chart data for the dashboard, without sending every factsheet"""
+    # today_count also depends on the date, so it is part of the tag
+    today = datetime.now().date()
+    not_modified = await _not_modified(request, response, today.isoformat())
+    if not_modified:
+        return not_modified
+    
+    factsheets = await collect_factsheets()
+    if not factsheets:
+        return FactsheetStats(total=0, avg_words=0, total_size=0, today_count=0)
+    
+    # collect_factsheets is newest first, so days are inserted in descending order
+    per_day = Counter(f.created_at.date().isoformat() for f in factsheets)
+    word_counts = [f.word_count for f in factsheets]
+    return FactsheetStats(
+        total=len(factsheets),
+        avg_words=sum(word_counts) / len(factsheets),
+        total_size=sum(f.file_size for f in factsheets),
+        today_count=per_day.get(today.isoformat(), 0),
+        word_count_histogram=word_count_histogram(word_counts),
+        daily_counts=[DailyCount(date=day, count=count) for day, count in reversed(per_day.items())]
+    )
+
 @router.get("/factsheets/{filename}", response_model=FactsheetContent)
-async def get_factsheet(filename: str):
+async def get_factsheet(filename: str, request: Request, response: Response):
     """Get a specific factsheet by filename"""
     factsheets_dir = get_factsheets_dir()
     file_path = factsheets_dir / filename
@@ -212,10 +599,18 @@ async def get_factsheet(filename: str):
         raise HTTPException(status_code=404, detail="Factsheet not found")
     
     try:
+        # The file's mtime and size identify this version; an unchanged file isn't read at all
+        stats = await asyncio.to_thread(file_path.stat)
+        etag = f'"{stats.st_mtime_ns:x}-{stats.st_size:x}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
             content = await f.read()
         
-        metadata = get_factsheet_metadata(file_path)
+        # Reuse the content just read instead of opening the file a second time
+        metadata = _extract_metadata_from_content(content, file_path, stats)
         
         return FactsheetContent(
             metadata=metadata,
@@ -225,7 +620,7 @@ async def get_factsheet(filename: str):
         logger.error(f"Error reading factsheet {filename}: {e}")
         raise HTTPException(status_code=500, detail="Error reading factsheet")
 
-@router.delete("/factsheets/{filename}")
+@router.delete("/factsheets/{filename}", response_model=MessageResponse)
 async def delete_factsheet(filename: str):
     """Delete a factsheet"""
     factsheets_dir = get_factsheets_dir()
@@ -237,7 +632,7 @@ async def delete_factsheet(filename: str):
     try:
         file_path.unlink()
         logger.info(f"Deleted factsheet: {filename}")
-        return {"message": f"Factsheet {filename} deleted successfully"}
+        return MessageResponse(message=f"Factsheet {filename} deleted successfully")
     except Exception as e:
         logger.error(f"Error deleting factsheet {filename}: {e}")
         raise HTTPException(status_code=500, detail="Error deleting factsheet")
@@ -257,7 +652,7 @@ async def download_factsheet(filename: str):
         media_type="text/markdown"
     )
 
-@router.get("/health")
+@router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now()}
\ No newline at end of file
+    return HealthResponse(status="healthy", timestamp=datetime.now())
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Task status storage for background factsheet generation"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .models import TaskStatus
+
+# Finished tasks are only polled briefly by the frontend
+TASK_TTL_SECONDS = 3600
+
+# Batch API jobs get a 24 hour completion window and must be pollable until they finish
+BATCH_TTL_SECONDS = 2 * 24 * 3600
+
+class InMemoryTaskStore:
+    """Per-process task storage; only valid with a single uvicorn worker"""
+
+    def __init__(self):
+        self._tasks: Dict[str, TaskStatus] = {}
+        self._batches: Dict[str, Dict[str, Any]] = {}
+
+    async def get(self, task_id: str) -> Optional[TaskStatus]:
+        return self._tasks.get(task_id)
+
+    async def get_json(self, task_id: str) -> Optional[str]:
+        task = self._tasks.get(task_id)
+        return task.model_dump_json() if task is not None else None
+
+    async def set(self, task: TaskStatus) -> None:
+        self._tasks[task.task_id] = task
+
+    async def update(self, task_id: str, **fields) -> None:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._tasks[task_id] = task.model_copy(update=fields)
+
+    async def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        return self._batches.get(batch_id)
+
+    async def set_batch(self, batch_id: str, job: Dict[str, Any]) -> None:
+        self._batches[batch_id] = job
+
+    async def close(self) -> None:
+        pass
+
+class RedisTaskStore:
+    """Task storage shared by every worker through Redis"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    async def get(self, task_id: str) -> Optional[TaskStatus]:
+        raw = await self._redis.get(self._key(task_id))
+        return TaskStatus.model_validate_json(raw) if raw else None
+
+    async def get_json(self, task_id: str) -> Optional[bytes]:
+        # Stored as TaskStatus JSON already, so it can be served without decoding
+        return await self._redis.get(self._key(task_id))
+
+    async def set(self, task: TaskStatus) -> None:
+        await self._redis.set(self._key(task.task_id), task.model_dump_json(), ex=TASK_TTL_SECONDS)
+
+    async def update(self, task_id: str, **fields) -> None:
+        # Each task has a single writer (its background job), so read-modify-write is safe
+        task = await self.get(task_id)
+        if task is not None:
+            await self.set(task.model_copy(update=fields))
+
+    async def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(f"batch:{batch_id}")
+        return json.loads(raw) if raw else None
+
+    async def set_batch(self, batch_id: str, job: Dict[str, Any]) -> None:
+        await self._redis.set(f"batch:{batch_id}", json.dumps(job), ex=BATCH_TTL_SECONDS)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+def create_task_store():
+    """Use Redis when REDIS_URL is set so multiple workers see the same tasks and batches"""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        return RedisTaskStore(redis_url)
+    return InMemoryTaskStore()
@@ -15,8 +15,29 @@ from fastapi.staticfiles import StaticFiles
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../src"))
 
-from .api.routes import router
+from .api.routes import router, task_store
 from src.logger import logger
+from src.synthesizer import close_clients
+
+class HealthCheckInterceptor:
+    """Answer GET /healthz before the middleware stack and router are involved
+    
+    Liveness probes fire far more often than real requests, so they get a fixed
+    empty 200 instead of routing, CORS handling and response serialization.
+    """
+    
+    _START = {"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"0")]}
+    _BODY = {"type": "http.response.body", "body": b""}
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/healthz" and scope["method"] == "GET":
+            await send(self._START)
+            await send(self._BODY)
+            return
+        await self.app(scope, receive, send)
 
 # Create FastAPI app
 app = FastAPI(
@@ -36,6 +57,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it wraps everything else, including CORS
+app.add_middleware(HealthCheckInterceptor)
+
 # Include API routes
 app.include_router(router)
 
@@ -59,6 +83,8 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown tasks"""
     logger.info("Shutting down Factsheet Generator API server")
+    await task_store.close()
+    await close_clients()
 
 @app.get("/")
 async def root():
@@ -67,7 +93,8 @@ async def root():
         "message": "Factsheet Generator API",
         "version": "1.0.0",
         "docs": "/docs",
-        "health": "/api/health"
+        "health": "/api/health",
+        "liveness": "/healthz"
     }
 
 if __name__ == "__main__":
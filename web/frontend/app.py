@@ -6,25 +6,29 @@ Features dashboard, generator, and viewer pages with real-time analytics.
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-import plotly.express as px
+import re
 import sys
 import os
+from types import MappingProxyType
 from src.logger import logger
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
-from utils import APIClient, wait_for_task_completion, format_file_size, validate_url, normalize_url, get_company_name_from_url
+from utils import APIClient, run_concurrently, wait_for_task_completion, format_file_size, parse_url, get_company_name_from_url
 
-# OpenAI models for factsheet generation
-OPENAI_MODELS = {
+# OpenAI models for factsheet generation (read-only; built once at import)
+OPENAI_MODELS = MappingProxyType({
     'gpt-5-nano': 'gpt-5-nano-2025-08-07',
     'gpt-4o-mini': 'gpt-4o-mini-2024-07-18',
     'gpt-4o': 'gpt-4o-2024-11-20',
     'gpt-5-mini': 'gpt-5-mini-2025-08-07',
     'gpt-4-turbo': 'gpt-4-turbo-2024-04-09',
     'gpt-5': 'gpt-5-2025-08-07', 
-}
+})
+# Model ID -> display name, for the select box's format_func
+MODEL_LABELS = MappingProxyType({model_id: name for name, model_id in OPENAI_MODELS.items()})
+# Select box options, so a render doesn't rebuild the list
+MODEL_IDS = tuple(MODEL_LABELS)
 
 # Page config
 st.set_page_config(
@@ -41,8 +45,9 @@ def get_api_client():
 
 api_client = get_api_client()
 
-# Custom CSS
-st.markdown("""
+# Custom CSS for every page, including the generator form. Streamlit drops elements
+# a rerun doesn't emit, so the block is sent once per run rather than cached.
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -75,12 +80,48 @@ st.markdown("""
         color: #dc3545;
         font-weight: bold;
     }
+    
+    .generator-section {
+        background: #f8f9fa;
+        padding: 2rem;
+        border-radius: 10px;
+        margin: 1rem 0;
+        border: 1px solid #e9ecef;
+    }
+    .form-row {
+        margin-bottom: 1.5rem;
+    }
+    .generate-btn {
+        background: linear-gradient(45deg, #007bff, #0056b3);
+        color: white;
+        padding: 0.75rem 2rem;
+        border: none;
+        border-radius: 5px;
+        font-weight: 600;
+        cursor: pointer;
+        width: 100%;
+        margin-top: 1rem;
+    }
+    .progress-section {
+        background: #f8f9fa;
+        padding: 1.5rem;
+        border-radius: 8px;
+        margin: 1rem 0;
+        border-left: 4px solid #007bff;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+@st.cache_data(ttl=5)
+def cached_health():
+    """Backend health, shared by the sidebar badge and the page check within a rerun"""
+    return api_client.health_check()
 
 def check_api_health():
     """Check if API is running"""
-    if not api_client.health_check():
+    if not cached_health():
         logger.error("**Backend API is not running!**")
         st.markdown("""
         Please start the FastAPI backend:
@@ -92,6 +133,79 @@ def check_api_health():
         return False
     return True
 
+def load_dashboard_data():
+    """Stats and a DataFrame of the five most recent factsheets"""
+    # Fetched on every run: the APIClient revalidates with If-None-Match, so an
+    # unchanged server answers 304 and changes from any session show up at once.
+    # The two requests are independent, so their round-trips overlap
+    stats, recent_factsheets = run_concurrently(
+        api_client.get_stats,
+        lambda: api_client.list_recent(limit=5)
+    )
+    return stats, recent_factsheets_frame(recent_factsheets)
+
+# Keyed by the listing itself, so the frame is only rebuilt when the server's
+# recent factsheets actually change
+@st.cache_data(max_entries=16, show_spinner=False)
+def recent_factsheets_frame(recent_factsheets):
+    """DataFrame of recent factsheets with a formatted creation time"""
+    import pandas as pd  # deferred: the generator and viewer pages don't need pandas
+
+    recent = pd.DataFrame(recent_factsheets)
+    if not recent.empty:
+        # Parse and format every timestamp in one vectorized pass
+        recent['created_fmt'] = pd.to_datetime(recent['created_at'], utc=True, format='ISO8601').dt.strftime('%Y-%m-%d %H:%M')
+    return recent
+
+# Leading factsheet chunks rendered inline (the title block and the overview);
+# the remaining "## " sections go into expanders
+VISIBLE_SECTIONS = 2
+_SECTION_RE = re.compile(r'^(?=## )', re.MULTILINE)
+
+@st.cache_data(show_spinner=False)
+def split_sections(content):
+    """Factsheet markdown split before each "## " heading, code fence removed"""
+    # Remove markdown code fence if present
+    display_content = content.removeprefix('```markdown\n').removesuffix('\n```')
+    return [section for section in _SECTION_RE.split(display_content) if section.strip()]
+
+# Tight margins around the dashboard charts (room for the title at the top)
+CHART_MARGIN = dict(l=20, r=20, t=40, b=20)
+
+# Figures are keyed by exactly the data they plot, so they are only rebuilt (and
+# re-serialized) when that data changes, not on navigation or unrelated reruns
+@st.cache_data(ttl=30)
+def word_count_figure(edges, counts):
+    """Word count distribution from pre-binned counts (counts[i] spans edges[i]..edges[i + 1])"""
+    import plotly.graph_objects as go  # deferred: only the dashboard charts need plotly
+    
+    # A plain Bar trace over the bins; plotly express would add a dataframe round-trip
+    fig = go.Figure(go.Bar(
+        x=[(lo + hi) / 2 for lo, hi in zip(edges, edges[1:])],
+        y=list(counts),
+        width=[hi - lo for lo, hi in zip(edges, edges[1:])]
+    ))
+    fig.update_layout(
+        title="Word Count Distribution",
+        xaxis_title="Word Count",
+        yaxis_title="count",
+        margin=CHART_MARGIN,
+        showlegend=False,
+        bargap=0
+    )
+    return fig
+
+@st.cache_data(ttl=30)
+def timeline_figure(daily_counts):
+    """Creation timeline for a tuple of (YYYY-MM-DD, count) pairs"""
+    import plotly.graph_objects as go
+    
+    dates, counts = zip(*daily_counts)
+    # WebGL trace: stays fast to draw however many days the history covers
+    fig = go.Figure(go.Scattergl(x=list(dates), y=list(counts), mode='lines+markers'))
+    fig.update_layout(title="Factsheets Created Over Time", margin=CHART_MARGIN, showlegend=False)
+    return fig
+
 def show_dashboard():
     """Show the main dashboard"""
     st.markdown('<h1 class="main-header">Factsheet Generator Dashboard</h1>', unsafe_allow_html=True)
@@ -100,10 +214,9 @@ def show_dashboard():
         return
     
     try:
-        # Get factsheets data
-        data = api_client.list_factsheets()
-        factsheets = data['factsheets']
-        total = data['total']
+        # Aggregates are computed by the backend; only the cards' factsheets are fetched
+        stats, recent = load_dashboard_data()
+        total = stats['total']
         
         # Metrics row
         col1, col2, col3, col4 = st.columns(4)
@@ -112,94 +225,76 @@ def show_dashboard():
             st.metric("Total Factsheets", total)
         
         with col2:
-            if factsheets:
-                avg_words = sum(f['word_count'] for f in factsheets) / len(factsheets)
-                st.metric("Avg Word Count", f"{avg_words:.0f}")
-            else:
-                st.metric("Avg Word Count", "0")
+            st.metric("Avg Word Count", f"{stats['avg_words']:.0f}")
         
         with col3:
-            if factsheets:
-                total_size = sum(f['file_size'] for f in factsheets)
-                st.metric("Total Size", format_file_size(total_size))
-            else:
-                st.metric("Total Size", "0 B")
+            st.metric("Total Size", format_file_size(stats['total_size']))
         
         with col4:
-            today_count = len([f for f in factsheets if f['created_at'].startswith(datetime.now().strftime('%Y-%m-%d'))])
-            st.metric("Created Today", today_count)
+            st.metric("Created Today", stats['today_count'])
         
-        if factsheets:
-            # Charts
+        if total:
+            # Charts are drawn from the backend's pre-binned stats
             st.subheader("Analytics")
             
+            histogram = stats['word_count_histogram']
+            hist_fig = word_count_figure(tuple(histogram['edges']), tuple(histogram['counts']))
+            timeline_fig = timeline_figure(tuple((day['date'], day['count']) for day in stats['daily_counts']))
             col1, col2 = st.columns(2)
             
             with col1:
-                # Word count distribution
-                word_counts = [f['word_count'] for f in factsheets]
-                fig = px.histogram(
-                    x=word_counts,
-                    nbins=10,
-                    title="Word Count Distribution",
-                    labels={'x': 'Word Count', 'y': 'Number of Factsheets'}
-                )
-                fig.update_layout(showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(hist_fig, use_container_width=True)
             
             with col2:
-                # Creation timeline
-                df = pd.DataFrame(factsheets)
-                df['date'] = pd.to_datetime(df['created_at']).dt.date
-                daily_counts = df.groupby('date').size().reset_index(name='count')
-                
-                fig = px.line(
-                    daily_counts,
-                    x='date',
-                    y='count',
-                    title="Factsheets Created Over Time",
-                    markers=True
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(timeline_fig, use_container_width=True)
             
             # Recent factsheets
             st.subheader("Recent Factsheets")
+            # One table instead of a container with four columns per factsheet;
+            # the selected row is what View and Delete act on
+            event = st.dataframe(
+                recent[['company_name', 'url', 'word_count', 'created_fmt']],
+                column_config={
+                    'company_name': st.column_config.TextColumn("Company"),
+                    'url': st.column_config.LinkColumn("Website"),
+                    'word_count': st.column_config.NumberColumn("Words"),
+                    'created_fmt': st.column_config.TextColumn("Created")
+                },
+                hide_index=True,
+                use_container_width=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key="recent_factsheets"
+            )
+            
+            # A selection can outlive a delete that shortened the table
+            rows = [row for row in event.selection.rows if row < len(recent)]
+            selected = recent['filename'].iloc[rows[0]] if rows else None
+            col1, col2, col3 = st.columns([4, 1, 1])
             
-            # Create a nice table display
-            for factsheet in factsheets[:5]:  # Show latest 5
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"**{factsheet['company_name']}**")
-                        st.caption(factsheet['url'])
-                    
-                    with col2:
-                        st.text(f"Words: {factsheet['word_count']}")
-                        st.caption(datetime.fromisoformat(factsheet['created_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M'))
-                    
-                    with col3:
-                        if st.button("View", key=f"view_{factsheet['filename']}"):
-                            st.session_state.selected_factsheet = factsheet['filename']
-                            st.session_state.page = "viewer"
-                            st.rerun()
-                    
-                    with col4:
-                        if st.button("Delete", key=f"delete_{factsheet['filename']}"):
-                            try:
-                                api_client.delete_factsheet(factsheet['filename'])
-                                st.success("Factsheet deleted!")
-                                st.rerun()
-                            except Exception as e:
-                                logger.error(f"Error deleting factsheet: {e}")
-                    
-                    st.divider()
+            with col1:
+                st.caption("Select a row to view or delete it")
+            
+            with col2:
+                if st.button("View", key="view_recent", disabled=selected is None, use_container_width=True):
+                    st.session_state.selected_factsheet = selected
+                    st.session_state.page = "viewer"
+                    st.rerun()
+            
+            with col3:
+                if st.button("Delete", key="delete_recent", disabled=selected is None, use_container_width=True):
+                    try:
+                        api_client.delete_factsheet(selected)
+                        st.success("Factsheet deleted!")
+                        st.rerun()
+                    except Exception as e:
+                        logger.error("Error deleting factsheet: %s", e)
         else:
             logger.info("No factsheets generated yet. Use the Generator to create your first one!")
             st.info("No factsheets generated yet. Use the Generator to create your first one!")
     
     except Exception as e:
-        logger.error(f"Error loading dashboard: {e}")
+        logger.error("Error loading dashboard: %s", e)
 
 def show_generator():
     st.markdown('<h1 class="main-header">Generate New Factsheet</h1>', unsafe_allow_html=True)
@@ -210,39 +305,6 @@ def show_generator():
         return
     logger.info("API health check passed")
     
-    st.markdown("""
-    <style>
-    .generator-section {
-        background: #f8f9fa;
-        padding: 2rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border: 1px solid #e9ecef;
-    }
-    .form-row {
-        margin-bottom: 1.5rem;
-    }
-    .generate-btn {
-        background: linear-gradient(45deg, #007bff, #0056b3);
-        color: white;
-        padding: 0.75rem 2rem;
-        border: none;
-        border-radius: 5px;
-        font-weight: 600;
-        cursor: pointer;
-        width: 100%;
-        margin-top: 1rem;
-    }
-    .progress-section {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border-left: 4px solid #007bff;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
     with st.form("factsheet_generator"):
         st.subheader("Company Information")
         
@@ -255,18 +317,16 @@ def show_generator():
         st.subheader("Model Configuration")
         
         if OPENAI_MODELS:
-            logger.info(f"Processing {len(OPENAI_MODELS)} models")
-            model_display_names = list(OPENAI_MODELS.keys())
-            
-            selected_model_key = st.selectbox(
+            logger.info("Processing %d models", len(OPENAI_MODELS))
+            # Options are the model IDs themselves; the display name is only rendered
+            selected_model = st.selectbox(
                 "OpenAI Model",
-                model_display_names,
+                MODEL_IDS,
+                format_func=MODEL_LABELS.get,
                 help="Select an OpenAI model for factsheet generation"
             )
             
-            logger.info(f"Selected model key: {selected_model_key}")
-            selected_model = OPENAI_MODELS[selected_model_key]
-            logger.info(f"Selected model ID: {selected_model}")
+            logger.info("Selected model ID: %s", selected_model)
         else:
             logger.error("No OpenAI models available")
             st.warning("No OpenAI models available")
@@ -286,8 +346,8 @@ def show_generator():
             elif not selected_model:
                 logger.error("Please select a model")
             else:
-                normalized_url = normalize_url(url)
-                if not validate_url(url):
+                url_ok, normalized_url = parse_url(url)
+                if not url_ok:
                     logger.error("Please enter a valid company domain")
                 else:
                     try:
@@ -309,6 +369,8 @@ def show_generator():
                             result = wait_for_task_completion(api_client, task_id, progress_bar, status_text)
                             
                             st.success("Factsheet generated successfully!")
+                            if result['result'].get('about_skipped'):
+                                st.info("The About page took too long, so this factsheet is based on the homepage only")
                             
                             st.session_state.generation_completed = True
                             st.session_state.completed_filename = result['result']['filename']
@@ -323,7 +385,7 @@ def show_generator():
                                 
                         except Exception as e:
                             error_message = str(e)
-                            logger.error(f"Generation failed: {error_message}")
+                            logger.error("Generation failed: %s", error_message)
                             
                             # Show user-friendly error messages
                             if "Failed to scrape" in error_message:
@@ -338,7 +400,7 @@ def show_generator():
                                 
                     except Exception as e:
                         error_message = str(e)
-                        logger.error(f"Error starting generation: {error_message}")
+                        logger.error("Error starting generation: %s", error_message)
                         st.error(f"Failed to start generation: {error_message}")
     
     if st.session_state.get('generation_completed', False):
@@ -369,7 +431,8 @@ def show_viewer():
         return
     
     try:
-        # Get factsheet content
+        # Get factsheet content; the APIClient revalidates it by ETag, so an
+        # unchanged factsheet comes back as a 304 and the cached copy is reused
         factsheet_data = api_client.get_factsheet(selected_filename)
         metadata = factsheet_data['metadata']
         content = factsheet_data['content']
@@ -386,30 +449,30 @@ def show_viewer():
             st.caption(f"Created: {datetime.fromisoformat(metadata['created_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')}")
         
         with col3:
-            # Download button
-            file_content = api_client.download_factsheet(selected_filename)
+            # Download button (reuses the content already fetched above)
             st.download_button(
                 "Download",
-                data=file_content,
+                data=content.encode('utf-8'),
                 file_name=selected_filename,
                 mime="text/markdown"
             )
         
         st.divider()
         
-        # Display factsheet content
-        # Remove markdown code fence if present
-        display_content = content
-        if display_content.startswith('```markdown\n'):
-            display_content = display_content[12:]  # Remove ```markdown\n
-        if display_content.endswith('\n```'):
-            display_content = display_content[:-4]  # Remove \n```
-            
+        # Display factsheet content: the title and overview up front, later
+        # sections collapsed so a long factsheet doesn't render all at once
+        sections = split_sections(content)
+        
         with st.container():
-            st.markdown(display_content)
+            for section in sections[:VISIBLE_SECTIONS]:
+                st.markdown(section)
+            for section in sections[VISIBLE_SECTIONS:]:
+                title, _, body = section.partition('\n')
+                with st.expander(title.removeprefix('## '), expanded=False):
+                    st.markdown(body)
         
     except Exception as e:
-        logger.error(f"Error loading factsheet: {e}")
+        logger.error("Error loading factsheet: %s", e)
 
 def main():
     """Main application"""
@@ -426,16 +489,22 @@ def main():
         "Viewer": "viewer"
     }
     
-    for page_name, page_key in pages.items():
-        if st.sidebar.button(page_name, key=f"nav_{page_key}"):
-            st.session_state.page = page_key
-            st.rerun()
+    # A radio only reruns when the selection actually changes; its index follows
+    # st.session_state.page so View buttons elsewhere still switch pages
+    page_keys = list(pages.values())
+    page_name = st.sidebar.radio(
+        "Go to",
+        list(pages.keys()),
+        index=page_keys.index(st.session_state.page),
+        label_visibility="collapsed"
+    )
+    st.session_state.page = pages[page_name]
     
     # Show API status in sidebar
     st.sidebar.divider()
     st.sidebar.subheader("System Status")
     
-    if api_client.health_check():
+    if cached_health():
         st.sidebar.success("API: Online")
     else:
         st.sidebar.error("API: Offline")
@@ -1,16 +1,102 @@
 """Shared utilities for the web interface"""
 
 import requests
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
+import json
+import re
+import threading
 import time
+from urllib.parse import urlparse, urlsplit
 import streamlit as st
 
+# orjson decodes the listing/stats payloads several times faster; stdlib json otherwise
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Threads for overlapping independent backend requests (the calls are I/O-bound)
+_request_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api")
+
+# Compiled once; validate_url runs on every generator form submit
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Backend hosts that share the machine with the frontend
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+# Retry idempotent requests (urllib3 never retries POST by default) on dropped
+# connections and 502/503/504 from a restarting backend. Refused connections are
+# not retried, so an offline backend is reported straight away.
+API_RETRIES = Retry(
+    total=3,
+    connect=0,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    raise_on_status=False
+)
+
+# Responses kept for ETag revalidation (least recently used dropped first)
+ETAG_CACHE_SIZE = 64
+
 class APIClient:
     """Client for communicating with the FastAPI backend"""
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url.rstrip('/')
+        # One keep-alive session per client; the pool covers run_concurrently's threads
         self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'factsheet-generator-web/1.0'})
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=API_RETRIES)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # (path, params) -> (ETag, decoded body) for conditional GETs of listings, stats and
+        # factsheets; shared by run_concurrently's threads, hence the lock
+        self._etag_cache: "OrderedDict[Tuple[str, Tuple], Tuple[str, Any]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+    
+    def _get_json_conditional(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a JSON endpoint, reusing the last body when the backend answers 304 Not Modified"""
+        key = (path, tuple(sorted((params or {}).items())))
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            with self._etag_lock:
+                if key in self._etag_cache:
+                    self._etag_cache.move_to_end(key)
+            return cached[1]
+        if response.status_code == 404:
+            # Gone (e.g. a deleted factsheet): don't keep its body around
+            self._forget_etag(key)
+        response.raise_for_status()
+        
+        data = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache[key] = (etag, data)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return data
+    
+    def _forget_etag(self, key: Tuple[str, Tuple]) -> None:
+        """Drop a stored conditional-GET response"""
+        with self._etag_lock:
+            self._etag_cache.pop(key, None)
     
     def generate_factsheet(self, url: str, model: Optional[str] = None) -> Dict[str, Any]:
         """Start factsheet generation"""
@@ -20,31 +106,49 @@ class APIClient:
         
         response = self.session.post(f"{self.base_url}/api/generate", json=data)
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get task status"""
         response = self.session.get(f"{self.base_url}/api/tasks/{task_id}")
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
     
-    def list_factsheets(self) -> Dict[str, Any]:
-        """List all factsheets"""
-        response = self.session.get(f"{self.base_url}/api/factsheets")
-        response.raise_for_status()
-        return response.json()
+    def stream_task_status(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """Task statuses pushed by the backend as they change, ending once the task finishes"""
+        with self.session.get(f"{self.base_url}/api/tasks/{task_id}/events", stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line.startswith(b"data: "):
+                    yield _json_loads(line[6:])
+    
+    def list_factsheets(self, limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
+        """List factsheets, newest first (all of them unless limit is given)"""
+        params = {"offset": offset} if offset else {}
+        if limit is not None:
+            params["limit"] = limit
+        
+        return self._get_json_conditional("/api/factsheets", params)
+    
+    def list_recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """The `limit` most recently created factsheets, newest first"""
+        data = self._get_json_conditional("/api/factsheets", {"sort": "-created_at", "limit": limit})
+        return data["factsheets"]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dashboard aggregates (total, avg_words, total_size, today_count)"""
+        return self._get_json_conditional("/api/stats")
     
     def get_factsheet(self, filename: str) -> Dict[str, Any]:
         """Get specific factsheet content"""
-        response = self.session.get(f"{self.base_url}/api/factsheets/{filename}")
-        response.raise_for_status()
-        return response.json()
+        return self._get_json_conditional(f"/api/factsheets/{filename}")
     
     def delete_factsheet(self, filename: str) -> Dict[str, Any]:
         """Delete a factsheet"""
         response = self.session.delete(f"{self.base_url}/api/factsheets/{filename}")
         response.raise_for_status()
-        return response.json()
+        self._forget_etag((f"/api/factsheets/{filename}", ()))
+        return _json_loads(response.content)
     
     def download_factsheet(self, filename: str) -> bytes:
         """Download factsheet file"""
@@ -55,37 +159,70 @@ class APIClient:
     def health_check(self) -> bool:
         """Check if API is healthy"""
         try:
-            response = self.session.get(f"{self.base_url}/api/health")
+            # Liveness endpoint answered ahead of the backend's routing; only the status matters
+            response = self.session.get(f"{self.base_url}/healthz")
             return response.status_code == 200
         except:
             return False
 
-def wait_for_task_completion(api_client: APIClient, task_id: str, progress_bar=None, status_text=None):
-    """Wait for task completion with progress updates"""
-    while True:
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """Run independent API calls in parallel, returning their results in order"""
+    futures = [_request_pool.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+def _show_task_status(status: Dict[str, Any], progress_bar=None, status_text=None) -> Optional[Dict[str, Any]]:
+    """Display a task status; return it once completed, raise if the task failed"""
+    if progress_bar:
+        progress_bar.progress(status['progress'] / 100)
+    
+    if status_text:
+        status_text.text(status['message'])
+    
+    if status['status'] == 'completed':
+        return status
+    elif status['status'] == 'failed':
+        error_msg = status.get('error', 'Task failed')
+        raise Exception(error_msg)
+    return None
+
+def wait_for_task_completion(api_client: APIClient, task_id: str, progress_bar=None, status_text=None,
+                             max_interval: Optional[float] = None):
+    """Wait for task completion with progress updates
+    
+    Follows the backend's task event stream, so each change arrives as it happens
+    over a single request. If the stream is unavailable or drops, falls back to
+    polling: quickly at first, backing off exponentially from 0.1s up to
+    max_interval (0.25s for a backend on this machine, 2s otherwise).
+    """
+    if max_interval is None:
+        host = urlparse(api_client.base_url).hostname
+        max_interval = 0.25 if host in LOCAL_HOSTS else 2.0
+    
+    try:
         try:
+            for status in api_client.stream_task_status(task_id):
+                finished = _show_task_status(status, progress_bar, status_text)
+                if finished:
+                    return finished
+        except requests.exceptions.RequestException:
+            pass  # No event stream (or it dropped): poll for the rest
+        
+        poll_count = 0
+        while True:
             status = api_client.get_task_status(task_id)
+            finished = _show_task_status(status, progress_bar, status_text)
+            if finished:
+                return finished
             
-            if progress_bar:
-                progress_bar.progress(status['progress'] / 100)
-            
-            if status_text:
-                status_text.text(status['message'])
+            time.sleep(min(max_interval, 0.1 * (1.5 ** poll_count)))
+            poll_count += 1
             
-            if status['status'] == 'completed':
-                return status
-            elif status['status'] == 'failed':
-                error_msg = status.get('error', 'Task failed')
-                raise Exception(error_msg)
-            
-            time.sleep(1)  # Poll every second
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Connection error: {e}")
-        except Exception as e:
-            if "Task failed" in str(e) or "Failed to scrape" in str(e):
-                raise e  # Re-raise task failures directly
-            raise Exception(f"Error checking task status: {e}")
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Connection error: {e}")
+    except Exception as e:
+        if "Task failed" in str(e) or "Failed to scrape" in str(e):
+            raise e  # Re-raise task failures directly
+        raise Exception(f"Error checking task status: {e}")
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
@@ -93,12 +230,12 @@ def format_file_size(size_bytes: int) -> str:
         return "0 B"
     
     size_names = ["B", "KB", "MB", "GB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
+    # Each unit is 2**10 larger, so the unit index comes straight from the bit length
+    i = min((size_bytes.bit_length() - 1) // 10, len(size_names) - 1)
+    s = round(size_bytes / (1 << (i * 10)), 2)
     return f"{s} {size_names[i]}"
 
+@lru_cache(maxsize=1024)
 def normalize_url(url: str) -> str:
     """Normalize URL by adding https:// and handling www"""
     url = url.strip()
@@ -108,35 +245,33 @@ def normalize_url(url: str) -> str:
         url = 'https://' + url
     
     # Add www. if domain doesn't have a subdomain (basic heuristic)
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    domain_parts = parsed.netloc.split('.')
+    parts = urlsplit(url)
+    netloc = parts.netloc
     
     # If domain has only 2 parts (like example.com), add www
-    if len(domain_parts) == 2 and not parsed.netloc.startswith('www.'):
-        url = url.replace(parsed.netloc, f'www.{parsed.netloc}', 1)
+    if netloc.count('.') == 1 and not netloc.startswith('www.'):
+        # The netloc starts right after "<scheme>://", so insert there without rescanning
+        start = len(parts.scheme) + 3
+        url = f"{url[:start]}www.{url[start:]}"
     
     return url
 
+@lru_cache(maxsize=256)
+def parse_url(url: str) -> Tuple[bool, str]:
+    """Normalize a URL once and validate the result: (is_valid, normalized_url)
+    
+    Cached because the same domain is often resubmitted within a session.
+    """
+    normalized_url = normalize_url(url)
+    return _URL_RE.match(normalized_url) is not None, normalized_url
+
 def validate_url(url: str) -> bool:
     """Validate if URL is properly formatted"""
-    import re
-    # Normalize first, then validate
-    normalized_url = normalize_url(url)
-    
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return url_pattern.match(normalized_url) is not None
+    return parse_url(url)[0]
 
 def get_company_name_from_url(url: str) -> str:
     """Extract company name from URL"""
     try:
-        from urllib.parse import urlparse
         domain = urlparse(url).netloc
         # Remove www. and common prefixes
         domain = domain.replace('www.', '').replace('app.', '').replace('api.', '')
@@ -148,8 +283,6 @@ def get_company_name_from_url(url: str) -> str:
 
 def sanitize_filename(title: str, fallback_url: str = "") -> str:
     """Create a safe filename from company domain"""
-    from urllib.parse import urlparse
-    
     # Always use the domain name, ignore the title
     if fallback_url:
         domain = urlparse(fallback_url).netloc